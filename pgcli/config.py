@@ -1,3 +1,4 @@
+import functools
 import shutil
 import os
 import platform
@@ -17,13 +18,40 @@ def config_location():
         return expanduser("~/.config/pgcli/")
 
 
+def cache_location():
+    if "XDG_CACHE_HOME" in os.environ:
+        return "%s/pgcli/" % expanduser(os.environ["XDG_CACHE_HOME"])
+    elif platform.system() == "Windows":
+        return config_location() + "cache\\"
+    else:
+        return expanduser("~/.cache/pgcli/")
+
+
+@functools.lru_cache(maxsize=8)
+def _parse_config_file(path, mtime_ns, size, encoding):
+    return ConfigObj(path, interpolation=False, encoding=encoding)
+
+
+def _parsed_config(path, encoding=None):
+    """Parse a config file, reusing the previous parse while it is unchanged.
+
+    The result is shared between callers and must not be modified; merge a
+    copy of it (its .dict()) instead.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return ConfigObj(path, interpolation=False, encoding=encoding)
+    return _parse_config_file(path, st.st_mtime_ns, st.st_size, encoding)
+
+
 def load_config(usr_cfg, def_cfg=None):
     # avoid config merges when possible. For writing, we need an umerged config instance.
     # see https://github.com/dbcli/pgcli/issues/1240 and https://github.com/DiffSK/configobj/issues/171
     if def_cfg:
         cfg = ConfigObj()
-        cfg.merge(ConfigObj(def_cfg, interpolation=False))
-        cfg.merge(ConfigObj(expanduser(usr_cfg), interpolation=False, encoding="utf-8"))
+        cfg.merge(_parsed_config(def_cfg).dict())
+        cfg.merge(_parsed_config(expanduser(usr_cfg), encoding="utf-8").dict())
     else:
         cfg = ConfigObj(expanduser(usr_cfg), interpolation=False, encoding="utf-8")
     cfg.filename = expanduser(usr_cfg)
@@ -6,11 +6,22 @@ This module provides support for loading DSN aliases from files in a
 """
 
 import os
+import json
 import logging
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
 from configobj import ConfigObj
 
 logger = logging.getLogger(__name__)
 
+# Marks a lazily computed attribute that hasn't been computed yet
+_UNSET = object()
+
+# dsn.d files are parsed in a thread pool when more than this many need parsing
+PARALLEL_PARSE_THRESHOLD = 4
+PARALLEL_PARSE_MAX_WORKERS = 8
+
 
 class DsnAliases:
     """DSN Aliases manager with support for loading from a directory.
@@ -32,34 +43,43 @@ class DsnAliases:
     """
 
     INCLUDE_DIR_NAME = "dsn.d"
+    INCLUDE_FILE_SUFFIX = ".conf"
     SECTION_NAME = "alias_dsn"
     DIRECTIVES = {"includedir"}
 
-    def __init__(self, config, include_dir=None):
+    def __init__(self, config, include_dir=None, cache_file=None):
         """Initialize DsnAliases.
 
         Args:
             config: The main ConfigObj configuration object
             include_dir: Optional path to the include directory. If None,
                         will be determined from config.filename
+            cache_file: Optional path to a file used to cache the parsed
+                        include files between runs. No cache if None.
         """
         self.config = config
         self._include_dir = include_dir
-        self._included_aliases = {}
-        self._load_included_aliases()
+        self._cache_file = cache_file
+        self._resolved_include_dir = _UNSET
+        # Included aliases are loaded on first access, see _ensure_loaded()
+        self._included_aliases: Optional[Dict[str, str]] = None
+        # Combined view of main config and included aliases, built on demand
+        self._merged_cache: Optional[Dict[str, str]] = None
+        self._sorted_keys_cache = None
 
     @classmethod
-    def from_config(cls, config, include_dir=None):
+    def from_config(cls, config, include_dir=None, cache_file=None):
         """Create a DsnAliases instance from a config object.
 
         Args:
             config: The main ConfigObj configuration object
             include_dir: Optional path to the include directory
+            cache_file: Optional path to the parsed include files cache
 
         Returns:
             DsnAliases instance
         """
-        return cls(config, include_dir)
+        return cls(config, include_dir, cache_file)
 
     def _get_include_dir(self):
         """Get the path to the dsn.d directory.
@@ -69,9 +89,17 @@ class DsnAliases:
         2. includedir directive in [alias_dsn] section
         3. Default dsn.d in config directory
 
+        The result is cached until reload_includes() is called.
+
         Returns:
             Path to the include directory, or None if it cannot be determined
         """
+        if self._resolved_include_dir is _UNSET:
+            self._resolved_include_dir = self._resolve_include_dir()
+        return self._resolved_include_dir
+
+    def _resolve_include_dir(self):
+        """Compute the include directory path, see _get_include_dir()."""
         if self._include_dir:
             return self._include_dir
 
@@ -94,30 +122,158 @@ class DsnAliases:
 
         return None
 
-    def _load_included_aliases(self):
-        """Load DSN aliases from all files in the include directory."""
+    def _ensure_loaded(self) -> Dict[str, str]:
+        """Load the included aliases if they haven't been loaded yet.
+
+        Returns:
+            Dictionary of included alias_name -> connection_string
+        """
+        if self._included_aliases is None:
+            self._included_aliases = self._load_included_aliases()
+        return self._included_aliases
+
+    def _get_merged(self) -> Dict[str, str]:
+        """Get the combined aliases from the include directory and main config.
+
+        Main config aliases take precedence; directives are excluded. The
+        result is cached until reload_includes() is called.
+
+        Returns:
+            Dictionary of alias_name -> connection_string
+        """
+        if self._merged_cache is None:
+            merged = dict(self._ensure_loaded())
+            merged.update((k, v) for k, v in self.config.get(self.SECTION_NAME, {}).items() if k not in self.DIRECTIVES)
+            self._merged_cache = merged
+        return self._merged_cache
+
+    def _load_included_aliases(self) -> Dict[str, str]:
+        """Load DSN aliases from all files in the include directory.
+
+        Returns:
+            Dictionary of alias_name -> connection_string, later files
+            overriding earlier ones
+        """
         include_dir = self._get_include_dir()
 
         if not include_dir:
             logger.debug("No include directory configured for DSN aliases")
-            return
-
-        if not os.path.isdir(include_dir):
-            logger.debug(f"DSN aliases include directory does not exist: {include_dir}")
-            return
+            return {}
 
         logger.debug(f"Loading DSN aliases from include directory: {include_dir}")
 
-        # Get all .conf files in the directory, sorted for consistent ordering
+        # Get all .conf files in the directory, sorted for consistent ordering.
+        # scandir exposes the entry type from the directory read itself, so
+        # this avoids an extra stat() per file. A missing directory is
+        # reported by scandir too, so there is no separate isdir() check.
+        suffix = self.INCLUDE_FILE_SUFFIX
+        entries = []
         try:
-            files = sorted(f for f in os.listdir(include_dir) if f.endswith(".conf") and os.path.isfile(os.path.join(include_dir, f)))
+            with os.scandir(include_dir) as it:
+                for entry in it:
+                    if not entry.name.endswith(suffix):
+                        continue
+                    try:
+                        if entry.is_file():
+                            entries.append(entry)
+                    except OSError as e:
+                        logger.debug(f"Skipping unreadable DSN aliases entry {entry.path}: {e}")
+        except (FileNotFoundError, NotADirectoryError):
+            logger.debug(f"DSN aliases include directory does not exist: {include_dir}")
+            return {}
         except OSError as e:
             logger.warning(f"Error reading DSN aliases include directory: {e}")
-            return
+            return {}
+
+        entries.sort(key=lambda e: e.name)
+
+        cache = self._read_cache()
+        new_cache = {}
+
+        # Resolve each file from the cache where possible, collecting the
+        # ones that need to be parsed
+        stats = []
+        results = {}
+        to_parse = []
+        for entry in entries:
+            try:
+                st = entry.stat()
+            except OSError:
+                st = None
+            stats.append(st)
+
+            cached = cache.get(entry.path) if st is not None else None
+            if st is not None and cached and cached.get("mtime_ns") == st.st_mtime_ns and cached.get("size") == st.st_size:
+                results[entry.path] = cached.get("aliases", {})
+                logger.debug(f"Using cached DSN aliases for {entry.name}")
+            else:
+                to_parse.append(entry.path)
+
+        # Overlap the file reads when there are enough files to be worth
+        # the thread pool start-up cost
+        if len(to_parse) > PARALLEL_PARSE_THRESHOLD:
+            with ThreadPoolExecutor(max_workers=min(PARALLEL_PARSE_MAX_WORKERS, len(to_parse))) as executor:
+                results.update(zip(to_parse, executor.map(self._load_aliases_from_file, to_parse)))
+        else:
+            for path in to_parse:
+                results[path] = self._load_aliases_from_file(path)
+
+        # Merged locally in sorted file order and published with a single
+        # update at the end; later files override earlier ones
+        included = {}
+        for entry, st in zip(entries, stats):
+            aliases = results[entry.path]
+            if aliases is None:
+                continue
+            included.update(aliases)
+            if st:
+                new_cache[entry.path] = {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "aliases": aliases}
+
+        if new_cache != cache:
+            self._write_cache(new_cache)
+
+        return included
+
+    def _read_cache(self):
+        """Read the parsed include files cache.
+
+        Returns:
+            Dictionary of filepath -> {mtime_ns, size, aliases}, empty if
+            there is no usable cache
+        """
+        if not self._cache_file:
+            return {}
+        try:
+            with open(self._cache_file, encoding="utf-8") as f:
+                cache = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.debug(f"Ignoring unreadable DSN aliases cache {self._cache_file}: {e}")
+            return {}
+        return cache if isinstance(cache, dict) else {}
+
+    def _write_cache(self, cache):
+        """Atomically write the parsed include files cache.
 
-        for filename in files:
-            filepath = os.path.join(include_dir, filename)
-            self._load_aliases_from_file(filepath)
+        Args:
+            cache: Dictionary of filepath -> {mtime_ns, size, aliases}
+        """
+        if not self._cache_file:
+            return
+        try:
+            cache_dir = os.path.dirname(self._cache_file) or "."
+            os.makedirs(cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=cache_dir, prefix=".dsnaliases.")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(cache, f)
+                os.replace(tmp_path, self._cache_file)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError as e:
+            logger.debug(f"Could not write DSN aliases cache {self._cache_file}: {e}")
 
     def _load_aliases_from_file(self, filepath):
         """Load DSN aliases from a single config file.
@@ -128,27 +284,32 @@ class DsnAliases:
 
         Args:
             filepath: Path to the config file to load
+
+        Returns:
+            Dictionary of the aliases found in the file, or None if the
+            file could not be parsed
         """
         try:
             file_config = ConfigObj(filepath, encoding="utf-8")
 
-            # First try to get from [alias_dsn] section
-            aliases = file_config.get(self.SECTION_NAME, {})
-
-            # If no section found, treat entire file as aliases
-            # (excluding any sections that might exist)
-            if not aliases:
+            # Use the [alias_dsn] section if present, otherwise treat the
+            # entire file as aliases (excluding any sections that might exist)
+            section = file_config.get(self.SECTION_NAME)
+            if section:
+                aliases = dict(section)
+            else:
                 aliases = {k: v for k, v in file_config.items() if not isinstance(v, dict)}
 
             if aliases:
                 logger.debug(f"Loaded {len(aliases)} DSN aliases from {os.path.basename(filepath)}")
-                # Merge aliases, later files override earlier ones
-                self._included_aliases.update(aliases)
             else:
                 logger.debug(f"No DSN aliases found in {os.path.basename(filepath)}")
 
+            return aliases
+
         except Exception as e:
             logger.warning(f"Error loading DSN aliases from {filepath}: {e}")
+            return None
 
     def list(self):
         """List all DSN aliases from config and include directory.
@@ -156,14 +317,9 @@ class DsnAliases:
         Returns:
             List of alias names (combined from main config and includes), sorted
         """
-        # Get aliases from main config (excluding directives)
-        main_aliases = {k: v for k, v in self.config.get(self.SECTION_NAME, {}).items() if k not in self.DIRECTIVES}
-
-        # Combine with included aliases (main config takes precedence)
-        all_aliases = dict(self._included_aliases)
-        all_aliases.update(main_aliases)
-
-        return sorted(all_aliases.keys())
+        if self._sorted_keys_cache is None:
+            self._sorted_keys_cache = sorted(self._get_merged())
+        return list(self._sorted_keys_cache)
 
     def get(self, name):
         """Get a DSN alias by name.
@@ -186,7 +342,7 @@ class DsnAliases:
             return main_aliases[name]
 
         # Then check included aliases
-        return self._included_aliases.get(name, None)
+        return self._ensure_loaded().get(name, None)
 
     def get_all(self):
         """Get all DSN aliases as a dictionary.
@@ -194,12 +350,7 @@ class DsnAliases:
         Returns:
             Dictionary of alias_name -> connection_string
         """
-        # Combine included aliases with main config (main takes precedence)
-        # Exclude directives
-        all_aliases = dict(self._included_aliases)
-        main_aliases = {k: v for k, v in self.config.get(self.SECTION_NAME, {}).items() if k not in self.DIRECTIVES}
-        all_aliases.update(main_aliases)
-        return all_aliases
+        return dict(self._get_merged())
 
     def get_source(self, name):
         """Get the source of a DSN alias (main config or include file).
@@ -211,10 +362,10 @@ class DsnAliases:
             'config' if from main config, 'include' if from include directory,
             or None if not found
         """
-        main_aliases = self.config.get(self.SECTION_NAME, {})
-        if name in main_aliases:
+        # Main config is read live, like get() does
+        if name in self.config.get(self.SECTION_NAME, {}):
             return "config"
-        if name in self._included_aliases:
+        if name in self._ensure_loaded():
             return "include"
         return None
 
@@ -222,14 +373,18 @@ class DsnAliases:
         """Reload DSN aliases from the include directory.
 
         This can be called to refresh the included aliases without
-        restarting pgcli.
+        restarting pgcli. The files are read again on the next access.
         """
-        self._included_aliases = {}
-        self._load_included_aliases()
+        self._resolved_include_dir = _UNSET
+        self._included_aliases = None
+        self._merged_cache = None
+        self._sorted_keys_cache = None
 
     def __iter__(self):
         """Iterate over all DSN alias names."""
-        return iter(self.list())
+        if self._sorted_keys_cache is None:
+            self._sorted_keys_cache = sorted(self._get_merged())
+        return iter(self._sorted_keys_cache)
 
     def __contains__(self, name):
         """Check if an alias exists."""
@@ -6,12 +6,14 @@ SSH tunnels using pgcli's configuration.
 """
 
 import fnmatch
+import functools
 import logging
 import os
+import re
+import shutil
 import subprocess
 import sys
-from pathlib import Path
-from typing import List, Optional
+from typing import Any, Callable, List, NamedTuple, Optional, Tuple
 
 import click
 
@@ -19,6 +21,64 @@ from .config import get_config
 from .ssh_tunnel import get_tunnel_manager_from_config
 
 
+# Resolved once at import; HOME is not expected to change while running
+_PGPASS_PATH = os.path.expanduser("~/.pgpass")
+
+# hostname:port:database:username:password, the password may contain colons
+_PGPASS_RE = re.compile(rb"(?!#)([^:]*):([^:]*):([^:]*):([^:]*):(.*)")
+
+
+def _compile_pgpass_field(pattern: bytes) -> Optional[Callable[[bytes], Any]]:
+    """Turn a .pgpass field into a matcher, or None if it matches anything."""
+    if pattern == b"*":
+        return None
+    if not any(c in pattern for c in b"*?["):
+        return pattern.__eq__
+    # Same translation fnmatch uses for bytes patterns
+    return re.compile(fnmatch.translate(pattern.decode("latin-1")).encode("latin-1")).match
+
+
+class _PgpassEntry(NamedTuple):
+    """One .pgpass line; a None matcher matches anything."""
+
+    host: Optional[Callable[[bytes], Any]]
+    port: bytes
+    database: Optional[Callable[[bytes], Any]]
+    user: Optional[Callable[[bytes], Any]]
+    password: str
+
+
+@functools.lru_cache(maxsize=1)
+def _load_pgpass(path: str, mtime_ns: int, size: int) -> Tuple[_PgpassEntry, ...]:
+    """
+    Parse a .pgpass file into (host, port, database, user, password) entries.
+
+    Host, database and user are matchers from _compile_pgpass_field(). The
+    result is cached until the file's modification time or size changes.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+
+    entries = []
+    for line in data.splitlines():
+        # Comments, blank and malformed lines simply don't match
+        m = _PGPASS_RE.match(line.strip())
+        if m is None:
+            continue
+
+        pg_host, pg_port, pg_db, pg_user, pg_pass = m.groups()
+        entries.append(
+            _PgpassEntry(
+                _compile_pgpass_field(pg_host),
+                pg_port,
+                _compile_pgpass_field(pg_db),
+                _compile_pgpass_field(pg_user),
+                pg_pass.decode("utf-8", "replace"),
+            )
+        )
+    return tuple(entries)
+
+
 def get_password_from_pgpass(host: str, port: int, database: str, user: str) -> Optional[str]:
     """
     Read password from ~/.pgpass file.
@@ -29,104 +89,38 @@ def get_password_from_pgpass(host: str, port: int, database: str, user: str) ->
     Returns:
         Password if found, None otherwise
     """
-    pgpass_path = Path.home() / ".pgpass"
-    if not pgpass_path.exists():
-        return None
-
     try:
-        with open(pgpass_path, "r") as f:
-            for line in f:
-                line = line.strip()
-                if not line or line.startswith("#"):
-                    continue
-
-                parts = line.split(":")
-                if len(parts) < 5:
-                    continue
-
-                # Handle escaped colons in password (last field)
-                pg_host, pg_port, pg_db, pg_user = parts[:4]
-                pg_pass = ":".join(parts[4:])  # Password may contain colons
-
-                # Match using fnmatch for wildcard support
-                if (
-                    (pg_host == "*" or fnmatch.fnmatch(host, pg_host))
-                    and (pg_port == "*" or str(port) == pg_port)
-                    and (pg_db == "*" or fnmatch.fnmatch(database, pg_db))
-                    and (pg_user == "*" or fnmatch.fnmatch(user, pg_user))
-                ):
-                    return pg_pass
+        st = os.stat(_PGPASS_PATH)
+        entries = _load_pgpass(_PGPASS_PATH, st.st_mtime_ns, st.st_size)
     except (IOError, PermissionError):
-        pass
+        return None
+
+    host_b = host.encode("utf-8")
+    port_b = str(port).encode("utf-8")
+    database_b = database.encode("utf-8")
+    user_b = user.encode("utf-8")
+
+    # Cheapest and most selective checks first
+    for host_match, pg_port, db_match, user_match, password in entries:
+        if (
+            (pg_port == b"*" or pg_port == port_b)
+            and (user_match is None or user_match(user_b))
+            and (db_match is None or db_match(database_b))
+            and (host_match is None or host_match(host_b))
+        ):
+            return password
 
     return None
 
 
-def parse_user_and_database(args: List[str]) -> tuple:
-    """
-    Parse user and database from command line arguments.
+@functools.lru_cache(maxsize=1)
+def _get_config_cached():
+    """Load the pgcli config once per process.
 
-    Returns:
-        Tuple of (user, database)
+    Scripts that drive cli() repeatedly in one interpreter reuse the parsed
+    ConfigObj. Failures are not cached, so a later call retries.
     """
-    user = os.environ.get("PGUSER", "postgres")
-    database = os.environ.get("PGDATABASE", "*")
-
-    i = 0
-    while i < len(args):
-        arg = args[i]
-
-        # Handle -U/--username
-        if arg in ("-U", "--username"):
-            if i + 1 < len(args):
-                user = args[i + 1]
-                i += 2
-                continue
-        elif arg.startswith("--username="):
-            user = arg.split("=", 1)[1]
-            i += 1
-            continue
-
-        # Handle -d/--dbname (simple case, not connection string)
-        if arg in ("-d", "--dbname"):
-            if i + 1 < len(args):
-                dbname = args[i + 1]
-                if "=" not in dbname:  # Not a connection string
-                    database = dbname
-                i += 2
-                continue
-        elif arg.startswith("--dbname="):
-            dbname = arg.split("=", 1)[1]
-            if "=" not in dbname:
-                database = dbname
-            i += 1
-            continue
-
-        # Positional database argument (last non-option arg)
-        if not arg.startswith("-") and i == len(args) - 1:
-            # Check if it's not a value for a previous option
-            option_flags = (
-                "-h",
-                "--host",
-                "-p",
-                "--port",
-                "-U",
-                "--username",
-                "-d",
-                "--dbname",
-                "-f",
-                "--file",
-                "-F",
-                "--format",
-            )
-            if i > 0 and args[i - 1] in option_flags:
-                pass
-            else:
-                database = arg
-
-        i += 1
-
-    return user, database
+    return get_config()
 
 
 def setup_logging(verbose: bool = False) -> logging.Logger:
@@ -146,113 +140,181 @@ def setup_logging(verbose: bool = False) -> logging.Logger:
     return logger
 
 
+# Fallback locations for distributions that don't put the PostgreSQL
+# client tools on PATH
+_PG_DUMP_FALLBACK_PATHS = (
+    "/usr/bin/pg_dump",
+    "/usr/local/bin/pg_dump",
+    "/usr/pgsql-17/bin/pg_dump",
+    "/usr/pgsql-16/bin/pg_dump",
+    "/usr/pgsql-15/bin/pg_dump",
+    "/usr/pgsql-14/bin/pg_dump",
+)
+
+
+@functools.lru_cache(maxsize=1)
 def find_pg_dump() -> str:
-    """Find pg_dump executable in PATH."""
-    # Check common locations
-    paths_to_check = [
-        "/usr/bin/pg_dump",
-        "/usr/local/bin/pg_dump",
-        "/usr/pgsql-17/bin/pg_dump",
-        "/usr/pgsql-16/bin/pg_dump",
-        "/usr/pgsql-15/bin/pg_dump",
-        "/usr/pgsql-14/bin/pg_dump",
-    ]
-
-    # First check PATH
-    for path in os.environ.get("PATH", "").split(os.pathsep):
-        pg_dump_path = os.path.join(path, "pg_dump")
-        if os.path.isfile(pg_dump_path) and os.access(pg_dump_path, os.X_OK):
-            return pg_dump_path
-
-    # Then check common locations
-    for path in paths_to_check:
+    """Find pg_dump executable in PATH.
+
+    The result is cached for the lifetime of the process, so changes to
+    PATH after the first call are not picked up; use
+    find_pg_dump.cache_clear() to force a new lookup.
+    """
+    path = shutil.which("pg_dump")
+    if path:
+        return path
+
+    for path in _PG_DUMP_FALLBACK_PATHS:
         if os.path.isfile(path) and os.access(path, os.X_OK):
             return path
 
     return "pg_dump"  # Fall back to PATH lookup
 
 
-def parse_connection_args(args: List[str]) -> tuple:
+class PgDumpArgs(NamedTuple):
+    """Connection details parsed from pg_dump style arguments."""
+
+    host: str
+    port: int
+    user: str
+    database: str
+    has_host: bool
+    has_port: bool
+    remaining_args: List[str]
+
+
+# Canonical names of the connection options, shared by the argument parser
+# and build_tunneled_args()
+_OPTION_NAMES = {
+    "-h": "host",
+    "--host": "host",
+    "-p": "port",
+    "--port": "port",
+    "-U": "username",
+    "--username": "username",
+    "-d": "dbname",
+    "--dbname": "dbname",
+}
+_SHORT_OPTIONS = {"host": "-h", "port": "-p", "username": "-U", "dbname": "-d"}
+
+# Options that take their value as the following argument
+OPTS_WITH_VALUE = frozenset((
+    "-h",
+    "--host",
+    "-p",
+    "--port",
+    "-U",
+    "--username",
+    "-d",
+    "--dbname",
+    "-f",
+    "--file",
+    "-F",
+    "--format",
+))
+
+
+def parse_pg_dump_args(args: List[str]) -> PgDumpArgs:
     """
-    Parse connection-related arguments from the command line.
+    Parse connection, user and database arguments in a single pass.
 
-    Returns:
-        Tuple of (host, port, remaining_args, has_host, has_port)
+    Host and port may also come from a connection string given as the
+    dbname; the database is the -d value or a trailing positional argument.
     """
     host = os.environ.get("PGHOST", "localhost")
     port = int(os.environ.get("PGPORT", 5432))
-    remaining_args = []
+    user = os.environ.get("PGUSER", "postgres")
+    database = os.environ.get("PGDATABASE", "*")
     has_host = False
     has_port = False
 
     i = 0
     while i < len(args):
         arg = args[i]
-
-        # Handle -h/--host
-        if arg in ("-h", "--host"):
-            if i + 1 < len(args):
-                host = args[i + 1]
-                has_host = True
-                remaining_args.extend([arg, args[i + 1]])
-                i += 2
-                continue
-        elif arg.startswith("--host="):
-            host = arg.split("=", 1)[1]
-            has_host = True
-            remaining_args.append(arg)
+        if arg.startswith("--") and "=" in arg:
+            opt, _, value = arg.partition("=")
+        elif arg in OPTS_WITH_VALUE and i + 1 < len(args):
+            opt, value = arg, args[i + 1]
             i += 1
-            continue
-
-        # Handle -p/--port
-        if arg in ("-p", "--port"):
-            if i + 1 < len(args):
-                port = int(args[i + 1])
-                has_port = True
-                remaining_args.extend([arg, args[i + 1]])
-                i += 2
-                continue
-        elif arg.startswith("--port="):
-            port = int(arg.split("=", 1)[1])
-            has_port = True
-            remaining_args.append(arg)
+        else:
+            # Positional database argument (last non-option arg)
+            if i == len(args) - 1 and not arg.startswith("-") and (i == 0 or args[i - 1] not in OPTS_WITH_VALUE):
+                database = arg
             i += 1
             continue
+        i += 1
 
-        # Handle -d/--dbname with connection string
-        if arg in ("-d", "--dbname"):
-            if i + 1 < len(args):
-                dbname = args[i + 1]
-                if "host=" in dbname:
-                    # Extract host from connection string
-                    for part in dbname.split():
-                        if part.startswith("host="):
-                            host = part.split("=", 1)[1]
-                            has_host = True
-                        elif part.startswith("port="):
-                            port = int(part.split("=", 1)[1])
-                            has_port = True
-                remaining_args.extend([arg, dbname])
-                i += 2
-                continue
-        elif arg.startswith("--dbname="):
-            dbname = arg.split("=", 1)[1]
-            if "host=" in dbname:
-                for part in dbname.split():
-                    if part.startswith("host="):
-                        host = part.split("=", 1)[1]
+        name = _OPTION_NAMES.get(opt)
+        if name == "host":
+            host = value
+            has_host = True
+        elif name == "port":
+            port = int(value)
+            has_port = True
+        elif name == "username":
+            user = value
+        elif name == "dbname":
+            if "=" not in value:  # Not a connection string
+                database = value
+            elif "host=" in value:
+                # Extract host and port from connection string
+                for part in value.split():
+                    key, _, part_value = part.partition("=")
+                    if key == "host":
+                        host = part_value
                         has_host = True
-                    elif part.startswith("port="):
-                        port = int(part.split("=", 1)[1])
+                    elif key == "port":
+                        port = int(part_value)
                         has_port = True
-            remaining_args.append(arg)
-            i += 1
-            continue
 
-        remaining_args.append(arg)
-        i += 1
+    return PgDumpArgs(host, port, user, database, has_host, has_port, list(args))
 
-    return host, port, remaining_args, has_host, has_port
+
+def parse_connection_args(args: List[str]) -> tuple:
+    """
+    Parse connection-related arguments from the command line.
+
+    Returns:
+        Tuple of (host, port, remaining_args, has_host, has_port)
+    """
+    parsed = parse_pg_dump_args(args)
+    return parsed.host, parsed.port, parsed.remaining_args, parsed.has_host, parsed.has_port
+
+
+def parse_user_and_database(args: List[str]) -> tuple:
+    """
+    Parse user and database from command line arguments.
+
+    Returns:
+        Tuple of (user, database)
+    """
+    parsed = parse_pg_dump_args(args)
+    return parsed.user, parsed.database
+
+
+def _rewrite_conninfo(conninfo: str, tunnel_host: str, tunnel_port: int) -> str:
+    """Point the host and port of a connection string at the tunnel."""
+    if "host=" not in conninfo:
+        return conninfo
+    new_parts = []
+    for part in conninfo.split():
+        key = part.partition("=")[0]
+        if key == "host":
+            new_parts.append(f"host={tunnel_host}")
+        elif key == "port":
+            new_parts.append(f"port={tunnel_port}")
+        else:
+            new_parts.append(part)
+    return " ".join(new_parts)
+
+
+# How each connection option's value is rewritten to go through the tunnel,
+# keyed by canonical option name
+_TUNNEL_REWRITES = {
+    "host": lambda value, tunnel_host, tunnel_port: tunnel_host,
+    "port": lambda value, tunnel_host, tunnel_port: str(tunnel_port),
+    "dbname": _rewrite_conninfo,
+}
 
 
 def build_tunneled_args(
@@ -267,78 +329,48 @@ def build_tunneled_args(
     """
     Build new argument list with tunneled connection parameters.
     """
+    # Common case: no host/port/dbname option to rewrite, only append
+    if not any(_OPTION_NAMES.get(arg.partition("=")[0]) in _TUNNEL_REWRITES for arg in original_args):
+        new_args = list(original_args)
+    else:
+        new_args = _rewrite_tunneled_args(original_args, tunnel_host, tunnel_port)
+
+    # Add host/port if they weren't in original args
+    if not has_host:
+        new_args.extend(["-h", tunnel_host])
+    if not has_port:
+        new_args.extend(["-p", str(tunnel_port)])
+
+    return new_args
+
+
+def _rewrite_tunneled_args(original_args: List[str], tunnel_host: str, tunnel_port: int) -> List[str]:
+    """Rewrite the host, port and dbname options to point at the tunnel."""
     new_args = []
     i = 0
 
     while i < len(original_args):
         arg = original_args[i]
+        i += 1
 
-        # Replace host arguments
-        if arg in ("-h", "--host"):
-            new_args.extend(["-h", tunnel_host])
-            i += 2  # Skip the original value
-            continue
-        elif arg.startswith("--host="):
-            new_args.append(f"--host={tunnel_host}")
-            i += 1
-            continue
-
-        # Replace port arguments
-        if arg in ("-p", "--port"):
-            new_args.extend(["-p", str(tunnel_port)])
-            i += 2
-            continue
-        elif arg.startswith("--port="):
-            new_args.append(f"--port={tunnel_port}")
-            i += 1
-            continue
-
-        # Handle connection strings in dbname
-        if arg in ("-d", "--dbname"):
-            if i + 1 < len(original_args):
-                dbname = original_args[i + 1]
-                if "host=" in dbname:
-                    # Replace host and port in connection string
-                    parts = dbname.split()
-                    new_parts = []
-                    for part in parts:
-                        if part.startswith("host="):
-                            new_parts.append(f"host={tunnel_host}")
-                        elif part.startswith("port="):
-                            new_parts.append(f"port={tunnel_port}")
-                        else:
-                            new_parts.append(part)
-                    new_args.extend(["-d", " ".join(new_parts)])
-                else:
-                    new_args.extend(["-d", dbname])
-                i += 2
+        if arg.startswith("--") and "=" in arg:
+            # --host=value, --port=value, --dbname=value
+            opt, _, value = arg.partition("=")
+            name = _OPTION_NAMES.get(opt)
+            rewrite = _TUNNEL_REWRITES.get(name) if name is not None else None
+            if rewrite is not None:
+                new_args.append(f"{opt}={rewrite(value, tunnel_host, tunnel_port)}")
+                continue
+        else:
+            # -h value, --host value, ... always emitted in the short form
+            name = _OPTION_NAMES.get(arg)
+            rewrite = _TUNNEL_REWRITES.get(name) if name is not None else None
+            if name is not None and rewrite is not None and i < len(original_args):
+                new_args.extend([_SHORT_OPTIONS[name], rewrite(original_args[i], tunnel_host, tunnel_port)])
+                i += 1
                 continue
-        elif arg.startswith("--dbname="):
-            dbname = arg.split("=", 1)[1]
-            if "host=" in dbname:
-                parts = dbname.split()
-                new_parts = []
-                for part in parts:
-                    if part.startswith("host="):
-                        new_parts.append(f"host={tunnel_host}")
-                    elif part.startswith("port="):
-                        new_parts.append(f"port={tunnel_port}")
-                    else:
-                        new_parts.append(part)
-                new_args.append(f"--dbname={' '.join(new_parts)}")
-            else:
-                new_args.append(arg)
-            i += 1
-            continue
 
         new_args.append(arg)
-        i += 1
-
-    # Add host/port if they weren't in original args
-    if not has_host:
-        new_args.extend(["-h", tunnel_host])
-    if not has_port:
-        new_args.extend(["-p", str(tunnel_port)])
 
     return new_args
 
@@ -394,13 +426,20 @@ def cli(ctx, ssh_tunnel: Optional[str], dsn_alias: Optional[str], verbose: bool)
 
     # Load pgcli config
     try:
-        config = get_config()
+        config = _get_config_cached()
     except Exception as e:
         logger.warning("Could not load pgcli config: %s", e)
         config = {}
 
-    # Parse connection arguments
-    host, port, remaining_args, has_host, has_port = parse_connection_args(pg_dump_args)
+    # Parse connection, user and database arguments
+    parsed = parse_pg_dump_args(pg_dump_args)
+    host, port, remaining_args, has_host, has_port = (
+        parsed.host,
+        parsed.port,
+        parsed.remaining_args,
+        parsed.has_host,
+        parsed.has_port,
+    )
     logger.debug("Parsed connection: host=%s, port=%d", host, port)
 
     # Setup SSH tunnel manager
@@ -421,10 +460,13 @@ def cli(ctx, ssh_tunnel: Optional[str], dsn_alias: Optional[str], verbose: bool)
     pg_dump_path = find_pg_dump()
     logger.debug("Using pg_dump: %s", pg_dump_path)
 
-    # Prepare environment (may need to set PGPASSWORD for tunneled connections)
-    env = os.environ.copy()
+    # Environment for the child process. None inherits ours unchanged; a copy
+    # is only made when PGPASSWORD has to be set for a tunneled connection.
+    env = None
+
+    tunneled = tunnel_host != host or tunnel_port != port
 
-    if tunnel_host != host or tunnel_port != port:
+    if tunneled:
         # Tunnel is active, modify connection args
         logger.debug("SSH tunnel active: %s:%d -> %s:%d", host, port, tunnel_host, tunnel_port)
         final_args = build_tunneled_args(
@@ -439,12 +481,13 @@ def cli(ctx, ssh_tunnel: Optional[str], dsn_alias: Optional[str], verbose: bool)
 
         # Look up password from .pgpass using ORIGINAL host (not tunneled)
         # This is needed because pg_dump will see 127.0.0.1 but .pgpass has the real host
-        if "PGPASSWORD" not in env:
-            user, database = parse_user_and_database(pg_dump_args)
+        if "PGPASSWORD" not in os.environ:
+            user, database = parsed.user, parsed.database
             logger.debug("Looking up password for %s@%s:%d/%s", user, host, port, database)
             password = get_password_from_pgpass(host, port, database, user)
             if password:
                 logger.debug("Found password in .pgpass for original host")
+                env = os.environ.copy()
                 env["PGPASSWORD"] = password
     else:
         # No tunnel, use original args
@@ -455,6 +498,10 @@ def cli(ctx, ssh_tunnel: Optional[str], dsn_alias: Optional[str], verbose: bool)
     logger.debug("Executing: %s", " ".join(cmd))
 
     try:
+        if not tunneled and os.name == "posix":
+            # No tunnel to clean up afterwards, so hand the process over to
+            # pg_dump instead of forking and waiting for it
+            os.execvp(pg_dump_path, cmd)
         result = subprocess.run(cmd, env=env)
         sys.exit(result.returncode)
     except FileNotFoundError:
@@ -5,17 +5,22 @@ This tool provides the same functionality as pg_dumpall but adds support for
 SSH tunnels using pgcli's configuration.
 """
 
+import functools
 import logging
 import os
+import shutil
 import subprocess
 import sys
-from typing import List, Optional
+from typing import Optional
 
 import click
 
 from .config import get_config
 from .ssh_tunnel import get_tunnel_manager_from_config
-from .dump import get_password_from_pgpass, parse_user_and_database
+from .dump import build_tunneled_args, get_password_from_pgpass, parse_pg_dump_args
+
+# Formerly defined here; still importable from pgcli.dumpall
+from .dump import parse_connection_args, parse_user_and_database  # noqa: F401
 
 
 def setup_logging(verbose: bool = False) -> logging.Logger:
@@ -35,201 +40,35 @@ def setup_logging(verbose: bool = False) -> logging.Logger:
     return logger
 
 
-def find_pg_dumpall() -> str:
-    """Find pg_dumpall executable in PATH."""
-    # Check common locations
-    paths_to_check = [
-        "/usr/bin/pg_dumpall",
-        "/usr/local/bin/pg_dumpall",
-        "/usr/pgsql-17/bin/pg_dumpall",
-        "/usr/pgsql-16/bin/pg_dumpall",
-        "/usr/pgsql-15/bin/pg_dumpall",
-        "/usr/pgsql-14/bin/pg_dumpall",
-    ]
-
-    # First check PATH
-    for path in os.environ.get("PATH", "").split(os.pathsep):
-        pg_dumpall_path = os.path.join(path, "pg_dumpall")
-        if os.path.isfile(pg_dumpall_path) and os.access(pg_dumpall_path, os.X_OK):
-            return pg_dumpall_path
-
-    # Then check common locations
-    for path in paths_to_check:
-        if os.path.isfile(path) and os.access(path, os.X_OK):
-            return path
+# Fallback locations for distributions that don't put the PostgreSQL
+# client tools on PATH
+_PG_DUMPALL_FALLBACK_PATHS = (
+    "/usr/bin/pg_dumpall",
+    "/usr/local/bin/pg_dumpall",
+    "/usr/pgsql-17/bin/pg_dumpall",
+    "/usr/pgsql-16/bin/pg_dumpall",
+    "/usr/pgsql-15/bin/pg_dumpall",
+    "/usr/pgsql-14/bin/pg_dumpall",
+)
 
-    return "pg_dumpall"  # Fall back to PATH lookup
 
+@functools.lru_cache(maxsize=1)
+def find_pg_dumpall() -> str:
+    """Find pg_dumpall executable in PATH.
 
-def parse_connection_args(args: List[str]) -> tuple:
+    The result is cached for the lifetime of the process, so changes to
+    PATH after the first call are not picked up; use
+    find_pg_dumpall.cache_clear() to force a new lookup.
     """
-    Parse connection-related arguments from the command line.
+    path = shutil.which("pg_dumpall")
+    if path:
+        return path
 
-    Returns:
-        Tuple of (host, port, remaining_args, has_host, has_port)
-    """
-    host = os.environ.get("PGHOST", "localhost")
-    port = int(os.environ.get("PGPORT", 5432))
-    remaining_args = []
-    has_host = False
-    has_port = False
-
-    i = 0
-    while i < len(args):
-        arg = args[i]
-
-        # Handle -h/--host
-        if arg in ("-h", "--host"):
-            if i + 1 < len(args):
-                host = args[i + 1]
-                has_host = True
-                remaining_args.extend([arg, args[i + 1]])
-                i += 2
-                continue
-        elif arg.startswith("--host="):
-            host = arg.split("=", 1)[1]
-            has_host = True
-            remaining_args.append(arg)
-            i += 1
-            continue
-
-        # Handle -p/--port
-        if arg in ("-p", "--port"):
-            if i + 1 < len(args):
-                port = int(args[i + 1])
-                has_port = True
-                remaining_args.extend([arg, args[i + 1]])
-                i += 2
-                continue
-        elif arg.startswith("--port="):
-            port = int(arg.split("=", 1)[1])
-            has_port = True
-            remaining_args.append(arg)
-            i += 1
-            continue
-
-        # Handle -d/--dbname with connection string
-        if arg in ("-d", "--dbname"):
-            if i + 1 < len(args):
-                dbname = args[i + 1]
-                if "host=" in dbname:
-                    # Extract host from connection string
-                    for part in dbname.split():
-                        if part.startswith("host="):
-                            host = part.split("=", 1)[1]
-                            has_host = True
-                        elif part.startswith("port="):
-                            port = int(part.split("=", 1)[1])
-                            has_port = True
-                remaining_args.extend([arg, dbname])
-                i += 2
-                continue
-        elif arg.startswith("--dbname="):
-            dbname = arg.split("=", 1)[1]
-            if "host=" in dbname:
-                for part in dbname.split():
-                    if part.startswith("host="):
-                        host = part.split("=", 1)[1]
-                        has_host = True
-                    elif part.startswith("port="):
-                        port = int(part.split("=", 1)[1])
-                        has_port = True
-            remaining_args.append(arg)
-            i += 1
-            continue
-
-        remaining_args.append(arg)
-        i += 1
-
-    return host, port, remaining_args, has_host, has_port
-
-
-def build_tunneled_args(
-    original_args: List[str],
-    tunnel_host: str,
-    tunnel_port: int,
-    original_host: str,
-    original_port: int,
-    has_host: bool,
-    has_port: bool,
-) -> List[str]:
-    """
-    Build new argument list with tunneled connection parameters.
-    """
-    new_args = []
-    i = 0
-
-    while i < len(original_args):
-        arg = original_args[i]
-
-        # Replace host arguments
-        if arg in ("-h", "--host"):
-            new_args.extend(["-h", tunnel_host])
-            i += 2  # Skip the original value
-            continue
-        elif arg.startswith("--host="):
-            new_args.append(f"--host={tunnel_host}")
-            i += 1
-            continue
-
-        # Replace port arguments
-        if arg in ("-p", "--port"):
-            new_args.extend(["-p", str(tunnel_port)])
-            i += 2
-            continue
-        elif arg.startswith("--port="):
-            new_args.append(f"--port={tunnel_port}")
-            i += 1
-            continue
-
-        # Handle connection strings in dbname
-        if arg in ("-d", "--dbname"):
-            if i + 1 < len(original_args):
-                dbname = original_args[i + 1]
-                if "host=" in dbname:
-                    # Replace host and port in connection string
-                    parts = dbname.split()
-                    new_parts = []
-                    for part in parts:
-                        if part.startswith("host="):
-                            new_parts.append(f"host={tunnel_host}")
-                        elif part.startswith("port="):
-                            new_parts.append(f"port={tunnel_port}")
-                        else:
-                            new_parts.append(part)
-                    new_args.extend(["-d", " ".join(new_parts)])
-                else:
-                    new_args.extend(["-d", dbname])
-                i += 2
-                continue
-        elif arg.startswith("--dbname="):
-            dbname = arg.split("=", 1)[1]
-            if "host=" in dbname:
-                parts = dbname.split()
-                new_parts = []
-                for part in parts:
-                    if part.startswith("host="):
-                        new_parts.append(f"host={tunnel_host}")
-                    elif part.startswith("port="):
-                        new_parts.append(f"port={tunnel_port}")
-                    else:
-                        new_parts.append(part)
-                new_args.append(f"--dbname={' '.join(new_parts)}")
-            else:
-                new_args.append(arg)
-            i += 1
-            continue
-
-        new_args.append(arg)
-        i += 1
-
-    # Add host/port if they weren't in original args
-    if not has_host:
-        new_args.extend(["-h", tunnel_host])
-    if not has_port:
-        new_args.extend(["-p", str(tunnel_port)])
-
-    return new_args
+    for path in _PG_DUMPALL_FALLBACK_PATHS:
+        if os.path.isfile(path) and os.access(path, os.X_OK):
+            return path
+
+    return "pg_dumpall"  # Fall back to PATH lookup
 
 
 @click.command(
@@ -289,7 +128,14 @@ def cli(ctx, ssh_tunnel: Optional[str], dsn_alias: Optional[str], verbose: bool)
         config = {}
 
     # Parse connection arguments
-    host, port, remaining_args, has_host, has_port = parse_connection_args(pg_dumpall_args)
+    parsed = parse_pg_dump_args(pg_dumpall_args)
+    host, port, remaining_args, has_host, has_port = (
+        parsed.host,
+        parsed.port,
+        parsed.remaining_args,
+        parsed.has_host,
+        parsed.has_port,
+    )
     logger.debug("Parsed connection: host=%s, port=%d", host, port)
 
     # Setup SSH tunnel manager
@@ -310,10 +156,13 @@ def cli(ctx, ssh_tunnel: Optional[str], dsn_alias: Optional[str], verbose: bool)
     pg_dumpall_path = find_pg_dumpall()
     logger.debug("Using pg_dumpall: %s", pg_dumpall_path)
 
-    # Prepare environment (may need to set PGPASSWORD for tunneled connections)
-    env = os.environ.copy()
+    # Environment for the child process. None inherits ours unchanged; a copy
+    # is only made when PGPASSWORD has to be set for a tunneled connection.
+    env = None
+
+    tunneled = tunnel_host != host or tunnel_port != port
 
-    if tunnel_host != host or tunnel_port != port:
+    if tunneled:
         # Tunnel is active, modify connection args
         logger.debug("SSH tunnel active: %s:%d -> %s:%d", host, port, tunnel_host, tunnel_port)
         final_args = build_tunneled_args(
@@ -328,13 +177,14 @@ def cli(ctx, ssh_tunnel: Optional[str], dsn_alias: Optional[str], verbose: bool)
 
         # Look up password from .pgpass using ORIGINAL host (not tunneled)
         # This is needed because pg_dumpall will see 127.0.0.1 but .pgpass has the real host
-        if "PGPASSWORD" not in env:
-            user, _ = parse_user_and_database(pg_dumpall_args)
+        if "PGPASSWORD" not in os.environ:
+            user = parsed.user
             # pg_dumpall connects to all databases, use wildcard
             logger.debug("Looking up password for %s@%s:%d/*", user, host, port)
             password = get_password_from_pgpass(host, port, "*", user)
             if password:
                 logger.debug("Found password in .pgpass for original host")
+                env = os.environ.copy()
                 env["PGPASSWORD"] = password
     else:
         # No tunnel, use original args
@@ -345,6 +195,10 @@ def cli(ctx, ssh_tunnel: Optional[str], dsn_alias: Optional[str], verbose: bool)
     logger.debug("Executing: %s", " ".join(cmd))
 
     try:
+        if not tunneled and os.name == "posix":
+            # No tunnel to clean up afterwards, so hand the process over to
+            # pg_dumpall instead of forking and waiting for it
+            os.execvp(pg_dumpall_path, cmd)
         result = subprocess.run(cmd, env=env)
         sys.exit(result.returncode)
     except FileNotFoundError:
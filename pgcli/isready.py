@@ -5,11 +5,13 @@ This tool provides the same functionality as pg_isready but adds support for
 SSH tunnels using pgcli's configuration.
 """
 
+import functools
 import logging
 import os
+import shutil
 import subprocess
 import sys
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
 import click
 
@@ -17,95 +19,144 @@ from .config import get_config
 from .ssh_tunnel import get_tunnel_manager_from_config
 
 
+# The handler installed by setup_logging(), replaced rather than added to
+# on later calls
+_log_handler: Optional[logging.StreamHandler] = None
+
+
 def setup_logging(verbose: bool = False) -> logging.Logger:
-    """Setup logging for pgcli_isready."""
+    """Setup logging for pgcli_isready.
+
+    Repeated calls leave the logger with a single handler; it is reused
+    as long as the verbosity and sys.stderr are unchanged.
+    """
+    global _log_handler
     logger = logging.getLogger("pgcli_isready")
+    level = logging.DEBUG if verbose else logging.WARNING
+    logger.setLevel(level)
+    if _log_handler is not None and _log_handler in logger.handlers and _log_handler.level == level and _log_handler.stream is sys.stderr:
+        return logger
+
     handler = logging.StreamHandler()
+    handler.setLevel(level)
     if verbose:
-        logger.setLevel(logging.DEBUG)
-        handler.setLevel(logging.DEBUG)
         formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
     else:
-        logger.setLevel(logging.WARNING)
-        handler.setLevel(logging.WARNING)
         formatter = logging.Formatter("%(message)s")
     handler.setFormatter(formatter)
+    if _log_handler is not None:
+        logger.removeHandler(_log_handler)
     logger.addHandler(handler)
+    _log_handler = handler
     return logger
 
 
+# Fallback locations for distributions that don't put the PostgreSQL
+# client tools on PATH
+_PG_ISREADY_FALLBACK_PATHS = (
+    "/usr/bin/pg_isready",
+    "/usr/local/bin/pg_isready",
+    "/usr/pgsql-17/bin/pg_isready",
+    "/usr/pgsql-16/bin/pg_isready",
+    "/usr/pgsql-15/bin/pg_isready",
+    "/usr/pgsql-14/bin/pg_isready",
+)
+
+
+@functools.lru_cache(maxsize=1)
 def find_pg_isready() -> str:
-    """Find pg_isready executable in PATH."""
-    paths_to_check = [
-        "/usr/bin/pg_isready",
-        "/usr/local/bin/pg_isready",
-        "/usr/pgsql-17/bin/pg_isready",
-        "/usr/pgsql-16/bin/pg_isready",
-        "/usr/pgsql-15/bin/pg_isready",
-        "/usr/pgsql-14/bin/pg_isready",
-    ]
-
-    for path in os.environ.get("PATH", "").split(os.pathsep):
-        pg_isready_path = os.path.join(path, "pg_isready")
-        if os.path.isfile(pg_isready_path) and os.access(pg_isready_path, os.X_OK):
-            return pg_isready_path
-
-    for path in paths_to_check:
+    """Find pg_isready executable in PATH.
+
+    The result is cached for the lifetime of the process, so changes to
+    PATH after the first call are not picked up; use
+    find_pg_isready.cache_clear() to force a new lookup.
+    """
+    path = shutil.which("pg_isready")
+    if path:
+        return path
+
+    for path in _PG_ISREADY_FALLBACK_PATHS:
         if os.path.isfile(path) and os.access(path, os.X_OK):
             return path
 
-    return "pg_isready"
+    return "pg_isready"  # Fall back to PATH lookup
 
 
-def parse_connection_args(args: List[str]) -> tuple:
+# Canonical names of the connection options that can go through a tunnel
+_CONNECTION_OPTIONS = {
+    "-h": "host",
+    "--host": "host",
+    "-p": "port",
+    "--port": "port",
+}
+
+
+def _split_option(arg: str):
+    """Return (name, inline value) for a connection option, else (None, None).
+
+    Only the long forms accept an inline ``--opt=value``; the value of a
+    bare option is the following argument.
     """
-    Parse connection-related arguments from the command line.
+    if arg.startswith("--"):
+        opt, sep, value = arg.partition("=")
+        if sep:
+            return _CONNECTION_OPTIONS.get(opt), value
+    return _CONNECTION_OPTIONS.get(arg), None
+
+
+def _scan_and_rewrite(
+    args: List[str],
+    tunnel_host: Optional[str] = None,
+    tunnel_port: Optional[int] = None,
+) -> Tuple[Optional[str], Optional[str], bool, bool, List[str]]:
+    """
+    Walk the arguments once, collecting the host and port options and,
+    when a tunnel endpoint is given, pointing them at it.
 
     Returns:
-        Tuple of (host, port, remaining_args, has_host, has_port)
+        Tuple of (host, port, has_host, has_port, new_args); host and port
+        are the raw values (None if absent) and new_args is empty unless
+        rewriting
     """
-    host = os.environ.get("PGHOST", "localhost")
-    port = int(os.environ.get("PGPORT", 5432))
-    remaining_args = []
-    has_host = False
-    has_port = False
+    new_args: List[str] = []
+    found: Dict[str, Optional[str]] = {"host": None, "port": None}
 
     i = 0
     while i < len(args):
         arg = args[i]
+        name, value = _split_option(arg)
+        i += 1
 
-        if arg in ("-h", "--host"):
-            if i + 1 < len(args):
-                host = args[i + 1]
-                has_host = True
-                remaining_args.extend([arg, args[i + 1]])
-                i += 2
-                continue
-        elif arg.startswith("--host="):
-            host = arg.split("=", 1)[1]
-            has_host = True
-            remaining_args.append(arg)
-            i += 1
+        if name is None:
+            if tunnel_host is not None:
+                new_args.append(arg)
             continue
-
-        if arg in ("-p", "--port"):
-            if i + 1 < len(args):
-                port = int(args[i + 1])
-                has_port = True
-                remaining_args.extend([arg, args[i + 1]])
-                i += 2
-                continue
-        elif arg.startswith("--port="):
-            port = int(arg.split("=", 1)[1])
-            has_port = True
-            remaining_args.append(arg)
-            i += 1
+        if value is not None:
+            found[name] = value
+            if tunnel_host is not None:
+                new_args.append(f"--{name}={tunnel_host if name == 'host' else tunnel_port}")
             continue
-
-        remaining_args.append(arg)
+        if i < len(args):
+            found[name] = args[i]
+        if tunnel_host is not None:
+            new_args.extend(["-h", tunnel_host] if name == "host" else ["-p", str(tunnel_port)])
         i += 1
 
-    return host, port, remaining_args, has_host, has_port
+    return found["host"], found["port"], found["host"] is not None, found["port"] is not None, new_args
+
+
+def parse_connection_args(args: List[str]) -> tuple:
+    """
+    Parse connection-related arguments from the command line.
+
+    Returns:
+        Tuple of (host, port, remaining_args, has_host, has_port)
+    """
+    host, raw_port, has_host, has_port, _ = _scan_and_rewrite(args)
+    if not has_host:
+        host = os.environ.get("PGHOST", "localhost")
+    port = int(raw_port) if raw_port is not None else int(os.environ.get("PGPORT", 5432))
+    return host, port, list(args), has_host, has_port
 
 
 def build_tunneled_args(
@@ -116,32 +167,11 @@ def build_tunneled_args(
     has_port: bool,
 ) -> List[str]:
     """Build new argument list with tunneled connection parameters."""
-    new_args = []
-    i = 0
-
-    while i < len(original_args):
-        arg = original_args[i]
-
-        if arg in ("-h", "--host"):
-            new_args.extend(["-h", tunnel_host])
-            i += 2
-            continue
-        elif arg.startswith("--host="):
-            new_args.append(f"--host={tunnel_host}")
-            i += 1
-            continue
+    # Common case: no host/port option to rewrite, only append
+    if not has_host and not has_port:
+        return [*original_args, "-h", tunnel_host, "-p", str(tunnel_port)]
 
-        if arg in ("-p", "--port"):
-            new_args.extend(["-p", str(tunnel_port)])
-            i += 2
-            continue
-        elif arg.startswith("--port="):
-            new_args.append(f"--port={tunnel_port}")
-            i += 1
-            continue
-
-        new_args.append(arg)
-        i += 1
+    new_args = _scan_and_rewrite(original_args, tunnel_host, tunnel_port)[4]
 
     if not has_host:
         new_args.extend(["-h", tunnel_host])
@@ -228,7 +258,8 @@ def cli(ctx, ssh_tunnel: Optional[str], dsn_alias: Optional[str], verbose: bool)
     pg_isready_path = find_pg_isready()
     logger.debug("Using pg_isready: %s", pg_isready_path)
 
-    if tunnel_host != host or tunnel_port != port:
+    tunneled = tunnel_host != host or tunnel_port != port
+    if tunneled:
         logger.debug("SSH tunnel active: %s:%d -> %s:%d", host, port, tunnel_host, tunnel_port)
         final_args = build_tunneled_args(
             remaining_args,
@@ -244,6 +275,10 @@ def cli(ctx, ssh_tunnel: Optional[str], dsn_alias: Optional[str], verbose: bool)
     logger.debug("Executing: %s", " ".join(cmd))
 
     try:
+        if not tunneled and os.name == "posix":
+            # No tunnel to clean up afterwards, so hand the process over to
+            # pg_isready instead of forking and waiting for it
+            os.execvp(pg_isready_path, cmd)
         result = subprocess.run(cmd)
         sys.exit(result.returncode)
     except FileNotFoundError:
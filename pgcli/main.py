@@ -66,6 +66,7 @@ from .config import (
     get_casing_file,
     load_config,
     config_location,
+    cache_location,
     get_config,
     get_config_filename,
 )
@@ -91,6 +92,9 @@ from .ssh_tunnel import SSHTunnelManager, SSH_TUNNEL_SUPPORT
 
 # Ref: https://stackoverflow.com/questions/30425105/filter-special-chars-such-as-color-codes-from-shell-output
 COLOR_CODE_REGEX = re.compile(r"\x1b(\[.*?[@-~]|\].*?(\x07|\x1b\\))")
+# Password in a URI / keyword DSN process title, see obfuscate_process_password()
+URI_PASSWORD_REGEX = re.compile(r":(.*):(.*)@")
+DSN_PASSWORD_REGEX = re.compile(r"password=(.+?)((\s[a-zA-Z]+=)|$)")
 DEFAULT_MAX_FIELD_WIDTH = 500
 
 
@@ -995,13 +999,13 @@ class PGCli:
         try:
             try:
                 pgexecute = PGExecute(
-                    database,
-                    user,
-                    passwd,
-                    host,
-                    port,
-                    dsn,
-                    notify_callback,
+                    database=database,
+                    user=user,
+                    password=passwd,
+                    host=host,
+                    port=port,
+                    dsn=dsn,
+                    notify_callback=notify_callback,
                     **kwargs,
                 )
             except (OperationalError, InterfaceError) as e:
@@ -1013,13 +1017,13 @@ class PGCli:
                         type=str,
                     )
                     pgexecute = PGExecute(
-                        database,
-                        user,
-                        passwd,
-                        host,
-                        port,
-                        dsn,
-                        notify_callback,
+                        database=database,
+                        user=user,
+                        password=passwd,
+                        host=host,
+                        port=port,
+                        dsn=dsn,
+                        notify_callback=notify_callback,
                         **kwargs,
                     )
                 else:
@@ -1926,7 +1930,7 @@ def cli(
     if list_dsn:
         try:
             cfg = load_config(pgclirc, config_full_path)
-            dsn_aliases = DsnAliases.from_config(cfg)
+            dsn_aliases = DsnAliases.from_config(cfg, cache_file=cache_location() + "dsnaliases.cache")
             for alias in dsn_aliases:
                 dsn_value = re.sub(r"://([^:]+):([^@]+)@", r"://\1:***@", dsn_aliases[alias])
                 click.secho(alias + " : " + dsn_value)
@@ -1991,7 +1995,7 @@ def cli(
     cfg = load_config(pgclirc, config_full_path)
     if dsn != "":
         try:
-            dsn_aliases = DsnAliases.from_config(cfg)
+            dsn_aliases = DsnAliases.from_config(cfg, cache_file=cache_location() + "dsnaliases.cache")
             dsn_config = dsn_aliases[dsn]
         except KeyError:
             click.secho(
@@ -2134,9 +2138,9 @@ def cli(
 def obfuscate_process_password():
     process_title = setproctitle.getproctitle()
     if "://" in process_title:
-        process_title = re.sub(r":(.*):(.*)@", r":\1:xxxx@", process_title)
+        process_title = URI_PASSWORD_REGEX.sub(r":\1:xxxx@", process_title)
     elif "=" in process_title:
-        process_title = re.sub(r"password=(.+?)((\s[a-zA-Z]+=)|$)", r"password=xxxx\2", process_title)
+        process_title = DSN_PASSWORD_REGEX.sub(r"password=xxxx\2", process_title)
 
     setproctitle.setproctitle(process_title)
 
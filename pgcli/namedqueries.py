@@ -6,12 +6,48 @@ named queries from files in a `namedqueries.d` directory.
 """
 
 import os
+import functools
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from configobj import ConfigObj
 from pgspecial.namedqueries import NamedQueries
 
 logger = logging.getLogger(__name__)
 
+# namedqueries.d files are read in a thread pool when there are more than
+# this many of them
+PARALLEL_PARSE_THRESHOLD = 4
+PARALLEL_PARSE_MAX_WORKERS = 8
+
+
+@functools.lru_cache(maxsize=128)
+def _parse_queries_file(filepath, section_name, mtime_ns, size):
+    """Parse the named queries out of a namedqueries.d file.
+
+    The modification time and size are only part of the cache key, so an
+    edited file is parsed again while an unchanged one is not.
+
+    Args:
+        filepath: Path to the config file to parse
+        section_name: Name of the named queries section
+        mtime_ns: The file's st_mtime_ns
+        size: The file's st_size
+
+    Returns:
+        Dictionary of query_name -> query_string
+    """
+    file_config = ConfigObj(filepath, encoding="utf-8")
+
+    # First try to get from [named queries] section
+    queries = file_config.get(section_name, {})
+
+    # If no section found, treat entire file as queries
+    # (excluding any sections that might exist)
+    if not queries:
+        queries = {k: v for k, v in file_config.items() if not isinstance(v, dict)}
+
+    return dict(queries)
+
 
 class ExtendedNamedQueries(NamedQueries):
     """Extended NamedQueries with support for loading from a directory.
@@ -35,6 +71,7 @@ class ExtendedNamedQueries(NamedQueries):
     """
 
     INCLUDE_DIR_NAME = "namedqueries.d"
+    INCLUDE_FILE_SUFFIX = ".conf"
 
     def __init__(self, config, include_dir=None):
         """Initialize ExtendedNamedQueries.
@@ -48,6 +85,7 @@ class ExtendedNamedQueries(NamedQueries):
         self._include_dir = include_dir
         self._included_queries = {}
         self._load_included_queries()
+        self._build_source()
 
     @classmethod
     def from_config(cls, config, include_dir=None):
@@ -95,6 +133,26 @@ class ExtendedNamedQueries(NamedQueries):
 
         return None
 
+    def _build_source(self):
+        """Build the query -> source map answered by get_source().
+
+        Main config queries take precedence; directives are excluded.
+        """
+        main_queries = self.config.get(self.section_name, {})
+        self._source = dict.fromkeys(self._included_queries, "include")
+        self._source.update(dict.fromkeys((k for k in main_queries if k not in self.DIRECTIVES), "config"))
+
+    def _update_source(self, name):
+        """Refresh the source of a single query after it was saved or deleted."""
+        if name in self.DIRECTIVES:
+            return
+        if name in self.config.get(self.section_name, {}):
+            self._source[name] = "config"
+        elif name in self._included_queries:
+            self._source[name] = "include"
+        else:
+            self._source.pop(name, None)
+
     def _load_included_queries(self):
         """Load named queries from all files in the include directory."""
         include_dir = self._get_include_dir()
@@ -103,22 +161,51 @@ class ExtendedNamedQueries(NamedQueries):
             logger.debug("No include directory configured for named queries")
             return
 
-        if not os.path.isdir(include_dir):
-            logger.debug(f"Named queries include directory does not exist: {include_dir}")
-            return
-
         logger.debug(f"Loading named queries from include directory: {include_dir}")
 
-        # Get all .conf files in the directory, sorted for consistent ordering
+        # Get all .conf files in the directory, sorted for consistent ordering.
+        # The cheap suffix check runs first, and scandir exposes the entry
+        # type from the directory read itself, so this avoids an extra
+        # stat() per file. A missing directory is reported by scandir too,
+        # so there is no separate isdir() check.
+        suffix = self.INCLUDE_FILE_SUFFIX
+        entries = []
         try:
-            files = sorted(f for f in os.listdir(include_dir) if f.endswith(".conf") and os.path.isfile(os.path.join(include_dir, f)))
+            with os.scandir(include_dir) as it:
+                for entry in it:
+                    if not entry.name.endswith(suffix):
+                        continue
+                    try:
+                        if entry.is_file():
+                            entries.append(entry)
+                    except OSError as e:
+                        logger.debug(f"Skipping unreadable named queries entry {entry.path}: {e}")
+        except (FileNotFoundError, NotADirectoryError):
+            logger.debug(f"Named queries include directory does not exist: {include_dir}")
+            return
         except OSError as e:
             logger.warning(f"Error reading named queries include directory: {e}")
             return
 
-        for filename in files:
-            filepath = os.path.join(include_dir, filename)
-            self._load_queries_from_file(filepath)
+        entries.sort(key=lambda e: e.name)
+
+        # Overlap the file reads when there are enough files to be worth
+        # the thread pool start-up cost
+        paths = [entry.path for entry in entries]
+        if len(paths) > PARALLEL_PARSE_THRESHOLD:
+            with ThreadPoolExecutor(max_workers=min(PARALLEL_PARSE_MAX_WORKERS, len(paths))) as executor:
+                results = list(executor.map(self._load_queries_from_file, paths))
+        else:
+            results = [self._load_queries_from_file(path) for path in paths]
+
+        # Merged locally in sorted file order and published with a single
+        # update at the end; later files override earlier ones
+        included = {}
+        for queries in results:
+            if queries:
+                included.update(queries)
+
+        self._included_queries.update(included)
 
     def _load_queries_from_file(self, filepath):
         """Load named queries from a single config file.
@@ -129,27 +216,25 @@ class ExtendedNamedQueries(NamedQueries):
 
         Args:
             filepath: Path to the config file to load
+
+        Returns:
+            Dictionary of the queries found in the file, or None if the
+            file could not be parsed
         """
         try:
-            file_config = ConfigObj(filepath, encoding="utf-8")
-
-            # First try to get from [named queries] section
-            queries = file_config.get(self.section_name, {})
-
-            # If no section found, treat entire file as queries
-            # (excluding any sections that might exist)
-            if not queries:
-                queries = {k: v for k, v in file_config.items() if not isinstance(v, dict)}
+            st = os.stat(filepath)
+            queries = _parse_queries_file(filepath, self.section_name, st.st_mtime_ns, st.st_size)
 
             if queries:
                 logger.debug(f"Loaded {len(queries)} named queries from {os.path.basename(filepath)}")
-                # Merge queries, later files override earlier ones
-                self._included_queries.update(queries)
             else:
                 logger.debug(f"No named queries found in {os.path.basename(filepath)}")
 
+            return queries
+
         except Exception as e:
             logger.warning(f"Error loading named queries from {filepath}: {e}")
+            return None
 
     # Directives that are not queries
     DIRECTIVES = {"includedir"}
@@ -160,14 +245,7 @@ class ExtendedNamedQueries(NamedQueries):
         Returns:
             List of query names (combined from main config and includes)
         """
-        # Get queries from main config (excluding directives)
-        main_queries = {k: v for k, v in self.config.get(self.section_name, {}).items() if k not in self.DIRECTIVES}
-
-        # Combine with included queries (main config takes precedence)
-        all_queries = dict(self._included_queries)
-        all_queries.update(main_queries)
-
-        return sorted(all_queries.keys())
+        return sorted(self.get_all())
 
     def get(self, name):
         """Get a named query by name.
@@ -184,8 +262,13 @@ class ExtendedNamedQueries(NamedQueries):
         if name in self.DIRECTIVES:
             return None
 
-        # First check main config (takes precedence)
         main_queries = self.config.get(self.section_name, {})
+
+        # Without namedqueries.d there is nothing to fall back to
+        if not self._included_queries:
+            return main_queries.get(name)
+
+        # First check main config (takes precedence)
         if name in main_queries:
             return main_queries[name]
 
@@ -200,10 +283,8 @@ class ExtendedNamedQueries(NamedQueries):
         """
         # Combine included queries with main config (main takes precedence)
         # Exclude directives
-        all_queries = dict(self._included_queries)
         main_queries = {k: v for k, v in self.config.get(self.section_name, {}).items() if k not in self.DIRECTIVES}
-        all_queries.update(main_queries)
-        return all_queries
+        return {**self._included_queries, **main_queries}
 
     def get_source(self, name):
         """Get the source of a named query (main config or include file).
@@ -215,12 +296,33 @@ class ExtendedNamedQueries(NamedQueries):
             'config' if from main config, 'include' if from include directory,
             or None if not found
         """
-        main_queries = self.config.get(self.section_name, {})
-        if name in main_queries:
-            return "config"
-        if name in self._included_queries:
-            return "include"
-        return None
+        return self._source.get(name)
+
+    def save(self, name, query):
+        """Save a named query to the main config.
+
+        Args:
+            name: The name of the query
+            query: The query string
+        """
+        super().save(name, query)
+        self._update_source(name)
+
+    def delete(self, name):
+        """Delete a named query from the main config.
+
+        A query of the same name in the include directory is not touched
+        and becomes visible again.
+
+        Args:
+            name: The name of the query
+
+        Returns:
+            Status message
+        """
+        message = super().delete(name)
+        self._update_source(name)
+        return message
 
     def reload_includes(self):
         """Reload named queries from the include directory.
@@ -230,3 +332,4 @@ class ExtendedNamedQueries(NamedQueries):
         """
         self._included_queries = {}
         self._load_included_queries()
+        self._build_source()
@@ -1,5 +1,6 @@
 import os
 import pytest
+from click.testing import CliRunner
 from utils import (
     POSTGRES_HOST,
     POSTGRES_PORT,
@@ -42,6 +43,12 @@ def executor(connection):
     )
 
 
+@pytest.fixture(scope="session")
+def cli_runner():
+    """One CliRunner shared by the CLI tests."""
+    return CliRunner()
+
+
 @pytest.fixture
 def exception_formatter():
     return lambda e: str(e)
@@ -1,10 +1,12 @@
 import io
 import os
 import stat
+from unittest.mock import patch
 
 import pytest
+from configobj import ConfigObj
 
-from pgcli.config import ensure_dir_exists, skip_initial_comment
+from pgcli.config import ensure_dir_exists, load_config, skip_initial_comment
 
 
 def test_ensure_file_parent(tmpdir):
@@ -41,3 +43,29 @@ def test_ensure_other_create_error(tmpdir):
 )
 def test_skip_initial_comment(text, skipped_lines):
     assert skip_initial_comment(io.StringIO(text)) == skipped_lines
+
+
+def test_load_config_reuses_parsed_files(tmpdir):
+    default = tmpdir.join("default")
+    default.write("[main]\nstyle = default\nkeys = a, b\n")
+    rcfile = tmpdir.join("rcfile")
+    rcfile.write("[main]\nstyle = monokai\n")
+
+    with patch("pgcli.config.ConfigObj", wraps=ConfigObj) as mock_configobj:
+        first = load_config(str(rcfile), str(default))
+        first["main"]["keys"].append("c")
+        second = load_config(str(rcfile), str(default))
+    # Two parses plus one empty ConfigObj per load_config() call
+    assert mock_configobj.call_count == 4
+    assert second["main"] == {"style": "monokai", "keys": ["a", "b"]}
+
+
+def test_load_config_rereads_modified_file(tmpdir):
+    default = tmpdir.join("default")
+    default.write("[main]\nstyle = default\n")
+    rcfile = tmpdir.join("rcfile")
+    rcfile.write("[main]\nstyle = monokai\n")
+    assert load_config(str(rcfile), str(default))["main"]["style"] == "monokai"
+
+    rcfile.write("[main]\nstyle = solarized\n")
+    assert load_config(str(rcfile), str(default))["main"]["style"] == "solarized"
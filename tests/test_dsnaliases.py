@@ -5,6 +5,7 @@ import os
 import tempfile
 import shutil
 import pytest
+from unittest.mock import patch
 from configobj import ConfigObj
 
 from pgcli.dsnaliases import DsnAliases
@@ -101,6 +102,21 @@ class TestDsnAliases:
         assert dsn.get_source("include-db") == "include"
         assert dsn.get_source("nonexistent") is None
 
+    def test_get_source_follows_config_changes(self):
+        """Test get_source agrees with get after the main config changes."""
+        config = self._create_config({"main-db": "postgresql://main.example.com/app"})
+        self._create_include_file("include.conf", {"include-db": "postgresql://include.example.com/app"})
+
+        dsn = DsnAliases.from_config(config)
+        assert dsn.get_source("include-db") == "include"
+
+        config["alias_dsn"]["include-db"] = "postgresql://override.example.com/app"
+        config["alias_dsn"]["new-db"] = "postgresql://new.example.com/app"
+
+        assert dsn.get("include-db") == "postgresql://override.example.com/app"
+        assert dsn.get_source("include-db") == "config"
+        assert dsn.get_source("new-db") == "config"
+
     def test_get_all(self):
         """Test get_all returns all aliases."""
         config = self._create_config({"main-db": "postgresql://main.example.com/app"})
@@ -267,6 +283,7 @@ class TestDsnAliases:
         # includedir should not appear as an alias
         assert "includedir" not in dsn.list()
         assert dsn.get("includedir") is None
+        assert dsn.get_source("includedir") == "config"
 
     def test_includedir_absolute_path(self):
         """Test includedir with absolute path."""
@@ -325,3 +342,100 @@ class TestDsnAliases:
         dsn = DsnAliases.from_config(config)
 
         assert dsn.list() == ["alpha-db", "mike-db", "zebra-db"]
+
+    def test_subdirectories_and_broken_symlinks_skipped(self):
+        """Test that non-file .conf entries don't abort loading."""
+        config = self._create_config()
+        self._create_include_file("valid.conf", {"valid-db": "postgresql://valid.example.com/app"})
+
+        os.makedirs(os.path.join(self.include_dir, "subdir.conf"))
+        os.symlink(os.path.join(self.temp_dir, "missing"), os.path.join(self.include_dir, "broken.conf"))
+
+        dsn = DsnAliases.from_config(config)
+
+        assert dsn.list() == ["valid-db"]
+
+    def test_cache_reused_for_unchanged_files(self):
+        """Test that unchanged include files are served from the cache."""
+        cache_file = os.path.join(self.temp_dir, "cache", "dsnaliases.cache")
+        config = self._create_config()
+        self._create_include_file("cached.conf", {"cached-db": "postgresql://cached.example.com/app"})
+
+        dsn = DsnAliases.from_config(config, cache_file=cache_file)
+        assert dsn.get("cached-db") == "postgresql://cached.example.com/app"
+        assert os.path.isfile(cache_file)
+
+        with patch.object(DsnAliases, "_load_aliases_from_file") as mock_load:
+            dsn = DsnAliases.from_config(config, cache_file=cache_file)
+            mock_load.assert_not_called()
+        assert dsn.get("cached-db") == "postgresql://cached.example.com/app"
+
+    def test_cache_invalidated_when_file_changes(self):
+        """Test that a modified include file is re-parsed."""
+        cache_file = os.path.join(self.temp_dir, "dsnaliases.cache")
+        config = self._create_config()
+        self._create_include_file("changing.conf", {"db": "postgresql://old.example.com/app"})
+        DsnAliases.from_config(config, cache_file=cache_file)
+
+        self._create_include_file("changing.conf", {"db": "postgresql://new-host.example.com/app"})
+        dsn = DsnAliases.from_config(config, cache_file=cache_file)
+
+        assert dsn.get("db") == "postgresql://new-host.example.com/app"
+
+    def test_corrupt_cache_ignored(self):
+        """Test that an unreadable cache file falls back to parsing."""
+        cache_file = os.path.join(self.temp_dir, "dsnaliases.cache")
+        with open(cache_file, "w") as f:
+            f.write("not json")
+        config = self._create_config()
+        self._create_include_file("valid.conf", {"valid-db": "postgresql://valid.example.com/app"})
+
+        dsn = DsnAliases.from_config(config, cache_file=cache_file)
+
+        assert dsn.list() == ["valid-db"]
+
+    def test_includes_loaded_lazily(self):
+        """Test that dsn.d is only read when an included alias is needed."""
+        config = self._create_config({"main-db": "postgresql://main.example.com/app"})
+        self._create_include_file("include.conf", {"include-db": "postgresql://include.example.com/app"})
+
+        with patch.object(DsnAliases, "_load_included_aliases") as mock_load:
+            dsn = DsnAliases.from_config(config)
+            assert dsn.get("main-db") == "postgresql://main.example.com/app"
+            mock_load.assert_not_called()
+
+            dsn.get("include-db")
+            dsn.list()
+            mock_load.assert_called_once()
+
+    def test_list_returns_copy(self):
+        """Test that mutating the list() result doesn't affect later calls."""
+        config = self._create_config({"db1": "postgresql://db1.example.com/app"})
+        dsn = DsnAliases.from_config(config)
+
+        dsn.list().append("bogus")
+        dsn.get_all()["bogus"] = "postgresql://bogus"
+
+        assert dsn.list() == ["db1"]
+        assert dsn.get_all() == {"db1": "postgresql://db1.example.com/app"}
+
+    def test_include_dir_is_a_file(self):
+        """Test that an include path which is not a directory is ignored."""
+        with open(self.include_dir, "w") as f:
+            f.write("not a directory")
+        config = self._create_config({"local": "postgresql://localhost/test"})
+
+        dsn = DsnAliases.from_config(config)
+
+        assert dsn.list() == ["local"]
+
+    def test_many_include_files_keep_sorted_override_order(self):
+        """Test that parallel parsing still applies files in sorted order."""
+        config = self._create_config()
+        for i in range(10):
+            self._create_include_file(f"{i:02d}.conf", {f"db{i}": f"postgresql://db{i}/app", "shared": f"postgresql://from{i}/app"})
+
+        dsn = DsnAliases.from_config(config)
+
+        assert len(dsn.list()) == 11
+        assert dsn.get("shared") == "postgresql://from9/app"
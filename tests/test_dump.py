@@ -2,13 +2,19 @@
 
 import os
 from unittest.mock import patch, MagicMock
+
+import pytest
 from click.testing import CliRunner
 
 from pgcli.dump import (
+    _get_config_cached,
     cli as dump_cli,
     find_pg_dump,
     parse_connection_args,
     build_tunneled_args,
+    get_password_from_pgpass,
+    parse_pg_dump_args,
+    parse_user_and_database,
     setup_logging,
 )
 from pgcli.dumpall import (
@@ -18,6 +24,25 @@ from pgcli.dumpall import (
 from pgcli.ssh_tunnel import get_tunnel_manager_from_config
 
 
+@pytest.fixture(autouse=True)
+def mock_execvp():
+    """Keep the no-tunnel exec path from replacing the test process.
+
+    The mock returns, so the CLI falls through to subprocess.run, which the
+    tests below patch and inspect.
+    """
+    with patch("pgcli.dump.os.execvp") as mock_exec:
+        yield mock_exec
+
+
+@pytest.fixture(autouse=True)
+def clear_config_cache():
+    """Make each test see its own patched get_config()."""
+    _get_config_cached.cache_clear()
+    yield
+    _get_config_cached.cache_clear()
+
+
 class TestParseConnectionArgs:
     """Tests for parse_connection_args function."""
 
@@ -83,6 +108,35 @@ class TestParseConnectionArgs:
         assert has_port is True
 
 
+class TestParsePgDumpArgs:
+    """Tests for the single-pass parse_pg_dump_args function."""
+
+    def test_all_fields(self):
+        """Test parsing host, port, user and database together."""
+        args = ["-h", "db.example.com", "--port=6543", "-U", "alice", "-F", "c", "mydb"]
+        parsed = parse_pg_dump_args(args)
+        assert parsed.host == "db.example.com"
+        assert parsed.port == 6543
+        assert parsed.user == "alice"
+        assert parsed.database == "mydb"
+        assert parsed.has_host and parsed.has_port
+        assert parsed.remaining_args == args
+
+    def test_connection_string_dbname(self):
+        """Test that a connection string dbname sets host/port but not database."""
+        with patch.dict(os.environ, {}, clear=True):
+            parsed = parse_pg_dump_args(["--dbname=host=db.example.com port=6000 dbname=app"])
+        assert parsed.host == "db.example.com"
+        assert parsed.port == 6000
+        assert parsed.database == "*"
+
+    def test_option_value_not_positional_database(self):
+        """Test that a trailing option value is not taken as the database."""
+        with patch.dict(os.environ, {}, clear=True):
+            assert parse_user_and_database(["-d", "mydb", "-f", "out.sql"]) == ("postgres", "mydb")
+            assert parse_user_and_database(["--username=bob", "-h", "db"]) == ("bob", "*")
+
+
 class TestBuildTunneledArgs:
     """Tests for build_tunneled_args function."""
 
@@ -111,6 +165,67 @@ class TestBuildTunneledArgs:
         assert "-p" in result
         assert "12345" in result
 
+    def test_no_connection_options_only_appends(self):
+        """Test that args without connection options are kept as-is."""
+        args = ["-F", "c", "-f", "out.dump", "mydb"]
+        result = build_tunneled_args(args, "127.0.0.1", 12345, "host", 5432, False, False)
+        assert result == args + ["-h", "127.0.0.1", "-p", "12345"]
+        assert args == ["-F", "c", "-f", "out.dump", "mydb"]
+
+
+class TestGetPasswordFromPgpass:
+    """Tests for get_password_from_pgpass function."""
+
+    def _write_pgpass(self, tmp_path, content):
+        (tmp_path / ".pgpass").write_text(content)
+
+    def _patch_pgpass_path(self, tmp_path):
+        return patch("pgcli.dump._PGPASS_PATH", str(tmp_path / ".pgpass"))
+
+    def test_no_pgpass_file(self, tmp_path):
+        """Test that a missing .pgpass returns None."""
+        with self._patch_pgpass_path(tmp_path):
+            assert get_password_from_pgpass("db.example.com", 5432, "mydb", "alice") is None
+
+    def test_exact_match(self, tmp_path):
+        """Test matching a fully specified line."""
+        self._write_pgpass(tmp_path, "other.example.com:5432:mydb:alice:wrong\ndb.example.com:5432:mydb:alice:secret\n")
+        with self._patch_pgpass_path(tmp_path):
+            assert get_password_from_pgpass("db.example.com", 5432, "mydb", "alice") == "secret"
+
+    def test_wildcards(self, tmp_path):
+        """Test that wildcard fields match any value."""
+        self._write_pgpass(tmp_path, "*.example.com:*:*:alice:secret\n")
+        with self._patch_pgpass_path(tmp_path):
+            assert get_password_from_pgpass("db.example.com", 6432, "mydb", "alice") == "secret"
+            assert get_password_from_pgpass("db.example.org", 6432, "mydb", "alice") is None
+
+    def test_port_mismatch(self, tmp_path):
+        """Test that a different port does not match."""
+        self._write_pgpass(tmp_path, "db.example.com:5433:mydb:alice:secret\n")
+        with self._patch_pgpass_path(tmp_path):
+            assert get_password_from_pgpass("db.example.com", 5432, "mydb", "alice") is None
+
+    def test_comments_and_short_lines_skipped(self, tmp_path):
+        """Test that comments, blank and malformed lines are ignored."""
+        self._write_pgpass(tmp_path, "# comment\n\ndb.example.com:5432\n*:*:*:*:fallback\n")
+        with self._patch_pgpass_path(tmp_path):
+            assert get_password_from_pgpass("db.example.com", 5432, "mydb", "alice") == "fallback"
+
+    def test_password_with_colons(self, tmp_path):
+        """Test that colons in the password are preserved."""
+        self._write_pgpass(tmp_path, "db.example.com:5432:mydb:alice:se:cr:et\n")
+        with self._patch_pgpass_path(tmp_path):
+            assert get_password_from_pgpass("db.example.com", 5432, "mydb", "alice") == "se:cr:et"
+
+    def test_parsed_file_reloaded_when_changed(self, tmp_path):
+        """Test that edits to .pgpass are picked up despite the parse cache."""
+        self._write_pgpass(tmp_path, "db.example.com:5432:mydb:alice:old\n")
+        with self._patch_pgpass_path(tmp_path):
+            assert get_password_from_pgpass("db.example.com", 5432, "mydb", "alice") == "old"
+            self._write_pgpass(tmp_path, "db.example.com:5432:mydb:alice:newer\n")
+            assert get_password_from_pgpass("db.example.com", 5432, "mydb", "alice") == "newer"
+
 
 class TestFindExecutables:
     """Tests for finding pg_dump and pg_dumpall executables."""
@@ -126,6 +241,17 @@ class TestFindExecutables:
         result = find_pg_dumpall()
         assert result.endswith("pg_dumpall")
 
+    def test_find_pg_dump_cached(self):
+        """Test that the PATH lookup only happens once per process."""
+        find_pg_dump.cache_clear()
+        try:
+            with patch("pgcli.dump.shutil.which", return_value="/opt/pg/bin/pg_dump") as mock_which:
+                assert find_pg_dump() == "/opt/pg/bin/pg_dump"
+                assert find_pg_dump() == "/opt/pg/bin/pg_dump"
+            mock_which.assert_called_once_with("pg_dump")
+        finally:
+            find_pg_dump.cache_clear()
+
 
 class TestDumpCli:
     """Tests for pgcli_dump CLI."""
@@ -185,6 +311,19 @@ class TestDumpCli:
 
         assert result.exit_code == 1
 
+    @patch("pgcli.dump.subprocess.run")
+    @patch("pgcli.dump.get_config")
+    def test_config_loaded_once(self, mock_config, mock_run):
+        """Test that repeated invocations reuse the parsed config."""
+        mock_config.return_value = {}
+        mock_run.return_value = MagicMock(returncode=0)
+
+        runner = CliRunner()
+        runner.invoke(dump_cli, ["-d", "mydb"])
+        runner.invoke(dump_cli, ["-d", "mydb"])
+
+        mock_config.assert_called_once()
+
 
 class TestDumpallCli:
     """Tests for pgcli_dumpall CLI."""
@@ -197,6 +336,14 @@ class TestDumpallCli:
         assert "pg_dumpall wrapper with SSH tunnel support" in result.output
         assert "--ssh-tunnel" in result.output
 
+    def test_shared_helpers_importable(self):
+        """Test the helpers pgcli_dumpall used to define are still importable from it."""
+        from pgcli import dumpall
+
+        assert dumpall.parse_connection_args is parse_connection_args
+        assert dumpall.build_tunneled_args is build_tunneled_args
+        assert dumpall.parse_user_and_database is parse_user_and_database
+
     @patch("pgcli.dumpall.subprocess.run")
     @patch("pgcli.dumpall.get_config")
     def test_passthrough_args(self, mock_config, mock_run):
@@ -399,6 +546,12 @@ class TestBuildTunneledArgsExtended:
         assert "host=127.0.0.1" in conn_str
         assert "port=12345" in conn_str
 
+    def test_connection_string_equals_format(self):
+        """Test replacing host/port in a --dbname=connection string."""
+        args = ["--dbname=host=original.host port=5432 dbname=mydb", "-U", "user"]
+        result = build_tunneled_args(args, "127.0.0.1", 12345, "original.host", 5432, True, True)
+        assert result == ["--dbname=host=127.0.0.1 port=12345 dbname=mydb", "-U", "user"]
+
     def test_preserves_all_other_options(self):
         """Test that all other pg_dump options are preserved."""
         args = [
@@ -602,6 +755,66 @@ class TestSSHTunnelBehavior:
         cmd = mock_run.call_args[0][0]
         assert "db.example.com" in cmd
         assert "5432" in cmd
+        # Without a tunnel the environment is inherited, not copied
+        assert mock_run.call_args[1]["env"] is None
+
+    @patch("pgcli.dump.subprocess.run")
+    @patch("pgcli.dump.get_config")
+    @patch("pgcli.dump.get_tunnel_manager_from_config")
+    def test_no_tunnel_execs_pg_dump(self, mock_tunnel_manager, mock_config, mock_run, mock_execvp):
+        """Test that without a tunnel the process is replaced by pg_dump."""
+        mock_config.return_value = {}
+        mock_manager = MagicMock()
+        mock_manager.start_tunnel.return_value = ("db.example.com", 5432)
+        mock_tunnel_manager.return_value = mock_manager
+
+        runner = CliRunner()
+        with patch("pgcli.dump.os.name", "posix"):
+            runner.invoke(dump_cli, ["-h", "db.example.com", "-p", "5432", "mydb"])
+
+        path, cmd = mock_execvp.call_args[0]
+        assert cmd == [path, "-h", "db.example.com", "-p", "5432", "mydb"]
+
+    @patch("pgcli.dump.subprocess.run")
+    @patch("pgcli.dump.get_config")
+    @patch("pgcli.dump.get_tunnel_manager_from_config")
+    def test_tunnel_does_not_exec(self, mock_tunnel_manager, mock_config, mock_run, mock_execvp):
+        """Test that with a tunnel pg_dump runs as a child so cleanup can happen."""
+        mock_config.return_value = {}
+        mock_run.return_value = MagicMock(returncode=0)
+        mock_manager = MagicMock()
+        mock_manager.start_tunnel.return_value = ("127.0.0.1", 54321)
+        mock_tunnel_manager.return_value = mock_manager
+
+        runner = CliRunner()
+        runner.invoke(dump_cli, ["-h", "db.internal.com", "-d", "mydb"])
+
+        mock_execvp.assert_not_called()
+        mock_run.assert_called_once()
+        mock_manager.stop_tunnel.assert_called_once()
+
+    @patch("pgcli.dump.get_password_from_pgpass", return_value="secret")
+    @patch("pgcli.dump.subprocess.run")
+    @patch("pgcli.dump.get_config")
+    @patch("pgcli.dump.get_tunnel_manager_from_config")
+    def test_tunnel_sets_pgpassword_from_pgpass(self, mock_tunnel_manager, mock_config, mock_run, mock_pgpass):
+        """Test that the .pgpass password for the original host is passed on."""
+        mock_config.return_value = {}
+        mock_run.return_value = MagicMock(returncode=0)
+        mock_manager = MagicMock()
+        mock_manager.start_tunnel.return_value = ("127.0.0.1", 54321)
+        mock_tunnel_manager.return_value = mock_manager
+
+        runner = CliRunner()
+        with patch.dict(os.environ, {"PGUSER": "alice"}):
+            os.environ.pop("PGPASSWORD", None)
+            os.environ.pop("PGPORT", None)
+            runner.invoke(dump_cli, ["-h", "db.internal.com", "-d", "mydb"])
+
+        mock_pgpass.assert_called_once_with("db.internal.com", 5432, "mydb", "alice")
+        env = mock_run.call_args[1]["env"]
+        assert env["PGPASSWORD"] == "secret"
+        assert env["PGUSER"] == "alice"
 
     @patch("pgcli.dump.subprocess.run")
     @patch("pgcli.dump.get_config")
@@ -1,8 +1,10 @@
 """Tests for pgcli_isready wrapper."""
 
 import subprocess
+from types import SimpleNamespace
 from unittest.mock import patch, MagicMock
-from click.testing import CliRunner
+
+import pytest
 
 from pgcli.isready import (
     cli,
@@ -11,6 +13,38 @@ from pgcli.isready import (
     build_tunneled_args,
     setup_logging,
 )
+from pgcli.ssh_tunnel import SSHTunnelManager
+
+
+@pytest.fixture(autouse=True)
+def mock_execvp():
+    """Keep the no-tunnel exec path from replacing the test process.
+
+    The mock returns, so the CLI falls through to subprocess.run, which the
+    tests below patch and inspect.
+    """
+    with patch("pgcli.isready.os.execvp") as mock_exec:
+        yield mock_exec
+
+
+@pytest.fixture
+def isready_mocks(monkeypatch):
+    """Patch out config loading, the tunnel manager and running pg_isready.
+
+    Returns a namespace of the mocks. By default the config is empty, the
+    tunnel manager hands back localhost:5432 and pg_isready exits with 0.
+    """
+    mocks = SimpleNamespace(
+        config=MagicMock(return_value={}),
+        run=MagicMock(return_value=MagicMock(spec=subprocess.CompletedProcess, returncode=0)),
+        manager=MagicMock(spec=SSHTunnelManager),
+    )
+    mocks.manager.start_tunnel.return_value = ("localhost", 5432)
+    mocks.tunnel_mgr = MagicMock(return_value=mocks.manager)
+    monkeypatch.setattr("pgcli.isready.get_config", mocks.config)
+    monkeypatch.setattr("pgcli.isready.subprocess.run", mocks.run)
+    monkeypatch.setattr("pgcli.isready.get_tunnel_manager_from_config", mocks.tunnel_mgr)
+    return mocks
 
 
 class TestParseConnectionArgs:
@@ -90,6 +124,11 @@ class TestBuildTunneledArgs:
         result = build_tunneled_args(args, "127.0.0.1", 12345, True, False)
         assert result == ["--host=127.0.0.1", "-p", "12345"]
 
+    def test_replace_long_options(self):
+        args = ["--host", "original.host", "--port=5432", "-t", "5"]
+        result = build_tunneled_args(args, "127.0.0.1", 12345, True, True)
+        assert result == ["-h", "127.0.0.1", "--port=12345", "-t", "5"]
+
     def test_add_host_port_when_missing(self):
         args = ["-d", "mydb", "-t", "5"]
         result = build_tunneled_args(args, "127.0.0.1", 12345, False, False)
@@ -113,133 +152,103 @@ class TestFindExecutable:
         result = find_pg_isready()
         assert "pg_isready" in result
 
+    def test_find_pg_isready_cached(self, tmp_path, monkeypatch):
+        """Test that the PATH lookup only happens once per process."""
+        executable = tmp_path / "pg_isready"
+        executable.write_text("#!/bin/sh\n")
+        executable.chmod(0o755)
+        find_pg_isready.cache_clear()
+        try:
+            monkeypatch.setenv("PATH", str(tmp_path))
+            assert find_pg_isready() == str(executable)
+            monkeypatch.setenv("PATH", "")
+            assert find_pg_isready() == str(executable)
+        finally:
+            find_pg_isready.cache_clear()
+
 
 class TestIsreadyCli:
     """Tests for the CLI interface."""
 
-    def test_help(self):
-        runner = CliRunner()
-        result = runner.invoke(cli, ["--help"])
+    def test_help(self, cli_runner):
+        result = cli_runner.invoke(cli, ["--help"])
         assert result.exit_code == 0
         assert "pg_isready wrapper" in result.output
 
-    @patch("pgcli.isready.subprocess.run")
-    @patch("pgcli.isready.get_config")
-    @patch("pgcli.isready.get_tunnel_manager_from_config")
-    def test_passthrough_args(self, mock_tunnel_mgr, mock_config, mock_run):
-        mock_config.return_value = {}
-        mock_run.return_value = MagicMock(returncode=0)
-        mock_manager = MagicMock()
-        mock_manager.start_tunnel.return_value = ("localhost", 5432)
-        mock_tunnel_mgr.return_value = mock_manager
-
-        runner = CliRunner()
-        runner.invoke(cli, ["-h", "myhost", "-p", "5432", "-t", "5"])
-
-        mock_run.assert_called_once()
-        cmd = mock_run.call_args[0][0]
+    def test_passthrough_args(self, isready_mocks, cli_runner):
+        cli_runner.invoke(cli, ["-h", "myhost", "-p", "5432", "-t", "5"])
+
+        isready_mocks.run.assert_called_once()
+        cmd = isready_mocks.run.call_args[0][0]
         assert "-h" in cmd
         assert "-t" in cmd
 
-    @patch("pgcli.isready.subprocess.run")
-    @patch("pgcli.isready.get_config")
-    @patch("pgcli.isready.get_tunnel_manager_from_config")
-    def test_with_ssh_tunnel_option(self, mock_tunnel_mgr, mock_config, mock_run):
-        mock_config.return_value = {}
-        mock_run.return_value = MagicMock(returncode=0)
-        mock_manager = MagicMock()
-        mock_manager.start_tunnel.return_value = ("127.0.0.1", 12345)
-        mock_tunnel_mgr.return_value = mock_manager
-
-        runner = CliRunner()
-        runner.invoke(cli, ["--ssh-tunnel", "user@bastion", "-h", "db.internal"])
-
-        mock_manager.start_tunnel.assert_called_once()
-        mock_manager.stop_tunnel.assert_called_once()
-
-    @patch("pgcli.isready.subprocess.run")
-    @patch("pgcli.isready.get_config")
-    @patch("pgcli.isready.get_tunnel_manager_from_config")
-    def test_exit_code_passthrough(self, mock_tunnel_mgr, mock_config, mock_run):
-        mock_config.return_value = {}
-        mock_manager = MagicMock()
-        mock_manager.start_tunnel.return_value = ("localhost", 5432)
-        mock_tunnel_mgr.return_value = mock_manager
-
-        for exit_code in [0, 1, 2, 3]:
-            mock_run.return_value = MagicMock(returncode=exit_code)
-            runner = CliRunner()
-            result = runner.invoke(cli, ["-h", "localhost"])
-            assert result.exit_code == exit_code
+    def test_with_ssh_tunnel_option(self, isready_mocks, cli_runner):
+        isready_mocks.manager.start_tunnel.return_value = ("127.0.0.1", 12345)
+
+        cli_runner.invoke(cli, ["--ssh-tunnel", "user@bastion", "-h", "db.internal"])
+
+        isready_mocks.manager.start_tunnel.assert_called_once()
+        isready_mocks.manager.stop_tunnel.assert_called_once()
+
+    def test_no_tunnel_execs_pg_isready(self, isready_mocks, cli_runner, mock_execvp):
+        with patch("pgcli.isready.os.name", "posix"):
+            cli_runner.invoke(cli, ["-h", "localhost", "-t", "5"])
+
+        mock_execvp.assert_called_once()
+        path, cmd = mock_execvp.call_args[0]
+        assert cmd == [path, "-h", "localhost", "-t", "5"]
+
+    def test_tunnel_does_not_exec(self, isready_mocks, cli_runner, mock_execvp):
+        isready_mocks.manager.start_tunnel.return_value = ("127.0.0.1", 12345)
+
+        cli_runner.invoke(cli, ["-h", "remote.host"])
+
+        mock_execvp.assert_not_called()
+        isready_mocks.run.assert_called_once()
+
+    @pytest.mark.parametrize("exit_code", [0, 1, 2, 3])
+    def test_exit_code_passthrough(self, isready_mocks, cli_runner, exit_code):
+        isready_mocks.run.return_value = MagicMock(spec=subprocess.CompletedProcess, returncode=exit_code)
+        result = cli_runner.invoke(cli, ["-h", "localhost"])
+        assert result.exit_code == exit_code
 
 
 class TestSSHTunnelBehavior:
     """Tests for SSH tunnel integration."""
 
-    @patch("pgcli.isready.subprocess.run")
-    @patch("pgcli.isready.get_config")
-    @patch("pgcli.isready.get_tunnel_manager_from_config")
-    def test_tunnel_modifies_host_and_port(self, mock_tunnel_mgr, mock_config, mock_run):
-        mock_config.return_value = {}
-        mock_run.return_value = MagicMock(returncode=0)
-        mock_manager = MagicMock()
-        mock_manager.start_tunnel.return_value = ("127.0.0.1", 54321)
-        mock_tunnel_mgr.return_value = mock_manager
+    def test_tunnel_modifies_host_and_port(self, isready_mocks, cli_runner):
+        isready_mocks.manager.start_tunnel.return_value = ("127.0.0.1", 54321)
 
-        runner = CliRunner()
-        runner.invoke(cli, ["-h", "remote.host", "-p", "5432"])
+        cli_runner.invoke(cli, ["-h", "remote.host", "-p", "5432"])
 
-        cmd = mock_run.call_args[0][0]
+        cmd = isready_mocks.run.call_args[0][0]
         assert "127.0.0.1" in cmd
         assert "54321" in cmd
 
-    @patch("pgcli.isready.subprocess.run")
-    @patch("pgcli.isready.get_config")
-    @patch("pgcli.isready.get_tunnel_manager_from_config")
-    def test_tunnel_cleanup_on_success(self, mock_tunnel_mgr, mock_config, mock_run):
-        mock_config.return_value = {}
-        mock_run.return_value = MagicMock(returncode=0)
-        mock_manager = MagicMock()
-        mock_manager.start_tunnel.return_value = ("127.0.0.1", 12345)
-        mock_tunnel_mgr.return_value = mock_manager
-
-        runner = CliRunner()
-        runner.invoke(cli, ["-h", "remote.host"])
-
-        mock_manager.stop_tunnel.assert_called_once()
-
-    @patch("pgcli.isready.subprocess.run")
-    @patch("pgcli.isready.get_config")
-    @patch("pgcli.isready.get_tunnel_manager_from_config")
-    def test_no_tunnel_preserves_original_args(self, mock_tunnel_mgr, mock_config, mock_run):
-        mock_config.return_value = {}
-        mock_run.return_value = MagicMock(returncode=0)
-        mock_manager = MagicMock()
-        mock_manager.start_tunnel.return_value = ("myhost", 5432)
-        mock_tunnel_mgr.return_value = mock_manager
-
-        runner = CliRunner()
-        runner.invoke(cli, ["-h", "myhost", "-p", "5432", "-t", "10"])
-
-        cmd = mock_run.call_args[0][0]
+    def test_tunnel_cleanup_on_success(self, isready_mocks, cli_runner):
+        isready_mocks.manager.start_tunnel.return_value = ("127.0.0.1", 12345)
+
+        cli_runner.invoke(cli, ["-h", "remote.host"])
+
+        isready_mocks.manager.stop_tunnel.assert_called_once()
+
+    def test_no_tunnel_preserves_original_args(self, isready_mocks, cli_runner):
+        isready_mocks.manager.start_tunnel.return_value = ("myhost", 5432)
+
+        cli_runner.invoke(cli, ["-h", "myhost", "-p", "5432", "-t", "10"])
+
+        cmd = isready_mocks.run.call_args[0][0]
         assert "myhost" in cmd
         assert "5432" in cmd
         assert "-t" in cmd
 
-    @patch("pgcli.isready.subprocess.run")
-    @patch("pgcli.isready.get_config")
-    @patch("pgcli.isready.get_tunnel_manager_from_config")
-    def test_tunnel_with_dsn_option(self, mock_tunnel_mgr, mock_config, mock_run):
-        mock_config.return_value = {}
-        mock_run.return_value = MagicMock(returncode=0)
-        mock_manager = MagicMock()
-        mock_manager.start_tunnel.return_value = ("127.0.0.1", 12345)
-        mock_tunnel_mgr.return_value = mock_manager
+    def test_tunnel_with_dsn_option(self, isready_mocks, cli_runner):
+        isready_mocks.manager.start_tunnel.return_value = ("127.0.0.1", 12345)
 
-        runner = CliRunner()
-        runner.invoke(cli, ["--dsn", "production", "-h", "db.internal"])
+        cli_runner.invoke(cli, ["--dsn", "production", "-h", "db.internal"])
 
-        mock_manager.start_tunnel.assert_called_once_with(host="db.internal", port=5432, dsn_alias="production")
+        isready_mocks.manager.start_tunnel.assert_called_once_with(host="db.internal", port=5432, dsn_alias="production")
 
 
 class TestVerboseMode:
@@ -257,45 +266,38 @@ class TestVerboseMode:
         logger = setup_logging(verbose=False)
         assert logger.level == logging.WARNING
 
+    def test_setup_logging_single_handler(self):
+        import logging
+
+        setup_logging(verbose=False)
+        setup_logging(verbose=False)
+        logger = setup_logging(verbose=True)
+        handlers = [h for h in logger.handlers if isinstance(h, logging.StreamHandler)]
+        assert len(handlers) == 1
+        assert handlers[0].level == logging.DEBUG
+
 
 class TestIntegrationWithRealPgIsready:
     """Integration tests using the real pg_isready binary."""
 
     def test_pg_isready_version(self):
-        result = subprocess.run([find_pg_isready(), "--version"], capture_output=True, text=True)
+        result = subprocess.run([find_pg_isready(), "--version"], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
         assert result.returncode == 0
-        assert "pg_isready" in result.stdout
+        assert b"pg_isready" in result.stdout
 
 
 class TestErrorHandling:
     """Tests for error handling."""
 
-    @patch("pgcli.isready.find_pg_isready")
-    @patch("pgcli.isready.subprocess.run")
-    @patch("pgcli.isready.get_config")
-    @patch("pgcli.isready.get_tunnel_manager_from_config")
-    def test_pg_isready_not_found(self, mock_tunnel_mgr, mock_config, mock_run, mock_find):
-        mock_config.return_value = {}
-        mock_find.return_value = "/nonexistent/pg_isready"
-        mock_run.side_effect = FileNotFoundError()
-        mock_manager = MagicMock()
-        mock_manager.start_tunnel.return_value = ("localhost", 5432)
-        mock_tunnel_mgr.return_value = mock_manager
-
-        runner = CliRunner()
-        result = runner.invoke(cli, ["-h", "localhost"])
+    def test_pg_isready_not_found(self, isready_mocks, cli_runner, monkeypatch):
+        monkeypatch.setattr("pgcli.isready.find_pg_isready", lambda: "/nonexistent/pg_isready")
+        isready_mocks.run.side_effect = FileNotFoundError()
+
+        result = cli_runner.invoke(cli, ["-h", "localhost"])
         assert result.exit_code == 1
 
-    @patch("pgcli.isready.get_config")
-    @patch("pgcli.isready.subprocess.run")
-    @patch("pgcli.isready.get_tunnel_manager_from_config")
-    def test_config_load_failure_continues(self, mock_tunnel_mgr, mock_run, mock_config):
-        mock_config.side_effect = Exception("config error")
-        mock_run.return_value = MagicMock(returncode=0)
-        mock_manager = MagicMock()
-        mock_manager.start_tunnel.return_value = ("localhost", 5432)
-        mock_tunnel_mgr.return_value = mock_manager
-
-        runner = CliRunner()
-        result = runner.invoke(cli, ["-h", "localhost"])
+    def test_config_load_failure_continues(self, isready_mocks, cli_runner):
+        isready_mocks.config.side_effect = Exception("config error")
+
+        result = cli_runner.invoke(cli, ["-h", "localhost"])
         assert result.exit_code == 0
@@ -904,13 +904,13 @@ def test_pg_service_file(tmpdir):
         os.environ["PGPASSWORD"] = "very_secure"
         cli.connect_service("my_other_service", None)
     mock_pgexecute.assert_called_with(
-        "b_dbname",
-        "b_user",
-        "very_secure",
-        "b_host",
-        "5435",
-        "",
-        notify_callback,
+        database="b_dbname",
+        user="b_user",
+        password="very_secure",
+        host="b_host",
+        port="5435",
+        dsn="",
+        notify_callback=notify_callback,
         application_name="pgcli",
     )
     del os.environ["PGPASSWORD"]
@@ -965,7 +965,16 @@ def test_application_name_db_uri(tmpdir):
         uri = "postgres://bar@baz.com/?application_name=cow"
         cli.connect_uri(uri)
     # connect_uri now passes the URI as dsn
-    mock_pgexecute.assert_called_with("bar", "bar", "", "baz.com", "", uri, notify_callback, application_name="cow")
+    mock_pgexecute.assert_called_with(
+        database="bar",
+        user="bar",
+        password="",
+        host="baz.com",
+        port="",
+        dsn=uri,
+        notify_callback=notify_callback,
+        application_name="cow",
+    )
 
 
 def test_jdbc_uri_error(tmpdir):
@@ -2,41 +2,46 @@
 """Tests for ExtendedNamedQueries with namedqueries.d support."""
 
 import os
-import tempfile
-import shutil
+from unittest.mock import patch
+
+import pytest
 from configobj import ConfigObj
 
+from pgcli import namedqueries
 from pgcli.namedqueries import ExtendedNamedQueries
 
 
+def _write_ini(path, section, mapping):
+    """Write a single config section without going through ConfigObj.
+
+    Values are double quoted, so they may contain commas and single quotes
+    but not double quotes.
+    """
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"[{section}]\n")
+        f.writelines(f'{k} = "{v}"\n' for k, v in mapping.items())
+
+
 class TestExtendedNamedQueries:
     """Tests for ExtendedNamedQueries class."""
 
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.temp_dir = tempfile.mkdtemp()
+    @pytest.fixture(autouse=True)
+    def _dirs(self, tmp_path):
+        """Set up the config file and include dir paths under tmp_path."""
+        self.temp_dir = str(tmp_path)
         self.config_file = os.path.join(self.temp_dir, "config")
         self.include_dir = os.path.join(self.temp_dir, "namedqueries.d")
-
-    def teardown_method(self):
-        """Clean up test fixtures."""
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
+        namedqueries._parse_queries_file.cache_clear()
 
     def _create_config(self, queries=None):
         """Create a main config file with optional named queries."""
-        config = ConfigObj(self.config_file, encoding="utf-8")
-        if queries:
-            config["named queries"] = queries
-        config.write()
+        _write_ini(self.config_file, "named queries", queries or {})
         return ConfigObj(self.config_file, encoding="utf-8")
 
     def _create_include_file(self, filename, queries):
         """Create an include file with named queries."""
         os.makedirs(self.include_dir, exist_ok=True)
-        filepath = os.path.join(self.include_dir, filename)
-        config = ConfigObj(filepath, encoding="utf-8")
-        config["named queries"] = queries
-        config.write()
+        _write_ini(os.path.join(self.include_dir, filename), "named queries", queries)
 
     def test_no_include_dir(self):
         """Test behavior when namedqueries.d doesn't exist."""
@@ -106,6 +111,22 @@ class TestExtendedNamedQueries:
         assert nq.get_source("include_query") == "include"
         assert nq.get_source("nonexistent") is None
 
+    def test_get_source_after_save_and_delete(self):
+        """Test that save() and delete() keep get_source() up to date."""
+        config = self._create_config({"main_query": "SELECT 1"})
+        self._create_include_file("test.conf", {"shared": "SELECT 2"})
+        nq = ExtendedNamedQueries.from_config(config)
+
+        nq.save("shared", "SELECT 3")
+        nq.save("new_query", "SELECT 4")
+        assert nq.get_source("shared") == "config"
+        assert nq.get_source("new_query") == "config"
+
+        nq.delete("shared")
+        nq.delete("main_query")
+        assert nq.get_source("shared") == "include"
+        assert nq.get_source("main_query") is None
+
     def test_get_all(self):
         """Test get_all method returns combined dictionary."""
         config = self._create_config({
@@ -141,6 +162,30 @@ class TestExtendedNamedQueries:
         nq.reload_includes()
         assert set(nq.list()) == {"q1", "q2"}
 
+    def test_unchanged_include_files_not_reparsed(self):
+        """Test that reloading skips parsing files that haven't changed."""
+        config = self._create_config()
+        self._create_include_file("test.conf", {"q1": "SELECT 1"})
+
+        with patch("pgcli.namedqueries.ConfigObj", wraps=ConfigObj) as mock_configobj:
+            nq = ExtendedNamedQueries.from_config(config)
+            nq.reload_includes()
+            ExtendedNamedQueries.from_config(config)
+
+        assert mock_configobj.call_count == 1
+        assert nq.list() == ["q1"]
+
+    def test_modified_include_file_reparsed(self):
+        """Test that a rewritten include file is parsed again on reload."""
+        config = self._create_config()
+        self._create_include_file("test.conf", {"q1": "SELECT 1"})
+        nq = ExtendedNamedQueries.from_config(config)
+
+        self._create_include_file("test.conf", {"q1": "SELECT 1", "q2": "SELECT 22"})
+        nq.reload_includes()
+
+        assert nq.list() == ["q1", "q2"]
+
     def test_only_conf_files_loaded(self):
         """Test that only .conf files are loaded from include dir."""
         config = self._create_config()
@@ -189,9 +234,10 @@ class TestExtendedNamedQueries:
         result = nq.delete("to_delete")
         assert "Deleted" in result
 
-        # Reload config and verify
-        config = ConfigObj(self.config_file, encoding="utf-8")
+        # test_save_query_to_main_config covers the write to disk
         assert "to_delete" not in config.get("named queries", {})
+        assert nq.get("to_delete") is None
+        assert nq.get_source("to_delete") is None
 
     def test_files_loaded_in_sorted_order(self):
         """Test that include files are loaded in sorted order."""
@@ -211,6 +257,17 @@ class TestExtendedNamedQueries:
         # the z_last.conf version should win
         assert nq.get("query") == "z_version"
 
+    def test_many_include_files_keep_sorted_override_order(self):
+        """Test that parallel parsing still applies files in sorted order."""
+        config = self._create_config()
+        for i in range(10):
+            self._create_include_file(f"{i:02d}.conf", {f"q{i}": f"SELECT {i}", "shared": f"SELECT 'from {i}'"})
+
+        nq = ExtendedNamedQueries.from_config(config)
+
+        assert len(nq.list()) == 11
+        assert nq.get("shared") == "SELECT 'from 9'"
+
     def test_explicit_include_dir(self):
         """Test using an explicit include directory path."""
         config = self._create_config()
@@ -276,10 +333,7 @@ class TestExtendedNamedQueries:
         os.makedirs(custom_dir)
 
         # Create config with includedir directive
-        config = ConfigObj(self.config_file, encoding="utf-8")
-        config["named queries"] = {"includedir": "./my_queries", "main_query": "SELECT 'main'"}
-        config.write()
-        config = ConfigObj(self.config_file, encoding="utf-8")
+        config = self._create_config({"includedir": "./my_queries", "main_query": "SELECT 'main'"})
 
         # Create a file in the custom directory
         custom_file = os.path.join(custom_dir, "custom.conf")
@@ -299,12 +353,7 @@ class TestExtendedNamedQueries:
         custom_dir = os.path.join(self.temp_dir, "absolute_queries")
         os.makedirs(custom_dir)
 
-        config = ConfigObj(self.config_file, encoding="utf-8")
-        config["named queries"] = {
-            "includedir": custom_dir  # absolute path
-        }
-        config.write()
-        config = ConfigObj(self.config_file, encoding="utf-8")
+        config = self._create_config({"includedir": custom_dir})  # absolute path
 
         custom_file = os.path.join(custom_dir, "test.conf")
         with open(custom_file, "w") as f: